@@ -0,0 +1,316 @@
+import argparse
+import gc
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Callable, Dict, Iterable, List, Optional
+
+from concurrency import ConcurrentFamily
+from constants import Operations, Relations, Responses
+from family import Family
+from geektrust import process, process_bytes, show
+from instrumentation import percentile
+from person import CompactPerson, Gender, Person
+from relations import RELATION_CLASS_PICKER
+from snapshot import load_snapshot, save_snapshot
+
+
+def build_people(person_class: type, count: int) -> list:
+    people = []
+    while len(people) < count:
+        index = len(people)
+        mother = person_class(name=f"mother{index}", gender=Gender.FEMALE)
+        father = person_class(name=f"father{index}", gender=Gender.MALE)
+        mother.set_spouse(spouse=father)
+        son = person_class(name=f"son{index}", gender=Gender.MALE)
+        daughter = person_class(name=f"daughter{index}", gender=Gender.FEMALE)
+        mother.add_children(children=[son, daughter])
+        people.extend([mother, father, son, daughter])
+
+    return people[:count]
+
+
+def grow_family(family: Family, count: int, fan_out: int = 3, depth: Optional[int] = None, seed: Optional[int] = None,
+                female_ratio: Optional[float] = None, marriage_rate: float = 1.0) -> Family:
+    rng = random.Random(seed)
+    mothers = deque((member, 0) for member in family.members if member.gender is Gender.FEMALE and member.spouse)
+    while family.total_members < count and mothers:
+        mother, generation = mothers.popleft()
+        if depth is not None and generation >= depth:
+            continue
+
+        for _ in range(fan_out if seed is None else rng.randint(1, fan_out)):
+            index = family.total_members
+            if female_ratio is None:
+                gender = Gender.MALE if index % 2 else Gender.FEMALE
+            else:
+                gender = Gender.FEMALE if rng.random() < female_ratio else Gender.MALE
+            status = family.add_member(mother_name=mother.name, new_member_name=f"member{index}",
+                                       new_member_gender=gender)
+            if status != Responses.CHILD_ADDITION_SUCCEEDED or rng.random() >= marriage_rate:
+                continue
+
+            child = family.member_exists(person_name=f"member{index}")
+            spouse_gender = Gender.FEMALE if gender is Gender.MALE else Gender.MALE
+            spouse = family.person_class(name=f"spouse{index}", gender=spouse_gender)
+            child.set_spouse(spouse=spouse)
+            family.register_member(member=spouse)
+            mothers.append((child if gender is Gender.FEMALE else spouse, generation + 1))
+
+    return family
+
+
+def latency_report(latencies: List[float]) -> Dict[str, float]:
+    total = sum(latencies)
+    return {
+        "operations": len(latencies),
+        "operations_per_second": len(latencies) / total if total else 0.0,
+        "p50_us": percentile(latencies, 0.50) * 1e6,
+        "p90_us": percentile(latencies, 0.90) * 1e6,
+        "p99_us": percentile(latencies, 0.99) * 1e6,
+        "max_us": max(latencies, default=0.0) * 1e6,
+    }
+
+
+def time_each(operation: Callable, arguments: list) -> List[float]:
+    latencies = []
+    clock = time.perf_counter
+    for argument in arguments:
+        started = clock()
+        operation(argument)
+        latencies.append(clock() - started)
+    return latencies
+
+
+def suite(members: int, fan_out: int, depth: Optional[int], samples: int, seed: int) -> Dict[str, dict]:
+    gc.collect()
+    tracemalloc.start()
+    grow_family(family=Family(), count=members, fan_out=fan_out, depth=depth)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    gc.collect()
+    started = time.perf_counter()
+    family = grow_family(family=Family(), count=members, fan_out=fan_out, depth=depth)
+    build_seconds = time.perf_counter() - started
+
+    rng = random.Random(seed)
+    sample = [rng.choice(family.members) for _ in range(samples)]
+    mothers = [member for member in family.members if member.gender is Gender.FEMALE and member.spouse]
+
+    report = {
+        "family": {"members": family.total_members, "fan_out": fan_out, "depth": depth,
+                   "build_seconds": build_seconds, "peak_bytes": peak},
+        "member_exists": latency_report(time_each(family.member_exists, [member.name for member in sample])),
+    }
+    for relation, relation_of in RELATION_CLASS_PICKER.items():
+        latencies = time_each(lambda member: relation_of(member).relatives(), sample)
+        report[f"relation.{relation.value}"] = latency_report(latencies)
+
+    additions = [(rng.choice(mothers).name, f"benchmark{index}") for index in range(samples)]
+    latencies = time_each(lambda addition: family.add_member(mother_name=addition[0], new_member_name=addition[1],
+                                                             new_member_gender=Gender.MALE), additions)
+    report["add_member"] = latency_report(latencies)
+    return report
+
+
+def _execute_if_chain(family: Family, words: List[str]):
+    output = None
+    if words[0] == Operations.ADD_CHILD.value:
+        output = family.add_member(mother_name=words[1],
+                                   new_member_name=words[2],
+                                   new_member_gender=Gender(words[3]))
+
+    elif words[0] == Operations.GET_RELATIONSHIP.value:
+        output = family.get_relationship(member_name=words[1],
+                                         relation=Relations(words[2]))
+
+    elif words[0] == Operations.IS_DESCENDANT.value:
+        output = family.is_descendant(member_name=words[1], ancestor_name=words[2])
+
+    elif words[0] == Operations.GET_GENERATION.value:
+        output = family.get_generation(member_name=words[1])
+
+    elif words[0] == Operations.GET_COMMON_ANCESTOR.value:
+        output = family.get_common_ancestors(member_name=words[1], other_member_name=words[2])
+
+    return output
+
+
+def _process_if_chain(lines: Iterable[str], family: Family, stream: IO[str]):
+    for line in lines:
+        words = line.split()
+        if not words:
+            continue
+
+        show(_execute_if_chain(family=family, words=words), stream=stream)
+
+
+def command_processing(members: int, commands: int, seed: int) -> Dict[str, float]:
+    family = grow_family(family=Family(), count=members)
+    rng = random.Random(seed)
+    mothers = [member.name for member in family.members if member.gender is Gender.FEMALE and member.spouse]
+    names = [member.name for member in family.members]
+    relations = [relation.value for relation in Relations]
+
+    lines = []
+    for index in range(commands):
+        if index % 100 == 0:
+            lines.append(f"ADD_CHILD {rng.choice(mothers)} command{index} {Gender.MALE.value}\n")
+        else:
+            lines.append(f"GET_RELATIONSHIP {rng.choice(names)} {rng.choice(relations)}\n")
+    encoded_lines = [line.encode() for line in lines]
+
+    report = {"commands": commands}
+    runs = (("if_chain", lambda family: _process_if_chain(lines=lines, family=family, stream=io.StringIO())),
+            ("process", lambda family: process(lines=lines, family=family, stream=io.StringIO())),
+            ("process_bytes", lambda family: process_bytes(lines=encoded_lines, family=family, stream=io.BytesIO())))
+    for name, run in runs:
+        family = grow_family(family=Family(), count=members)
+        started = time.perf_counter()
+        run(family)
+        elapsed = time.perf_counter() - started
+        report[f"{name}_seconds"] = elapsed
+        report[f"{name}_commands_per_second"] = commands / elapsed
+
+    report["speedup"] = report["if_chain_seconds"] / report["process_bytes_seconds"]
+    return report
+
+
+def snapshot_start(count: int) -> Dict[str, float]:
+    started = time.perf_counter()
+    family = grow_family(family=Family(), count=count)
+    replay_seconds = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "family.snapshot")
+        save_snapshot(family=family, path=path)
+        size = os.path.getsize(path)
+        del family
+        gc.collect()
+
+        started = time.perf_counter()
+        loaded_family = load_snapshot(path=path)
+        load_seconds = time.perf_counter() - started
+
+    return {
+        "members": loaded_family.total_members,
+        "replay_seconds": replay_seconds,
+        "snapshot_load_seconds": load_seconds,
+        "snapshot_bytes": size,
+        "speedup": replay_seconds / load_seconds,
+    }
+
+
+def thread_scaling(members: int, operations: int, max_threads: int, write_ratio: float,
+                   seed: int) -> Dict[str, object]:
+    family = ConcurrentFamily(family=grow_family(family=Family(), count=members))
+    mothers = [member.name for member in family.family.members if member.gender is Gender.FEMALE and member.spouse]
+    names = [member.name for member in family.family.members]
+    relations = list(Relations)
+
+    def run(threads: int, round_index: int):
+        per_thread = operations // threads
+
+        def work(thread_index: int):
+            thread_rng = random.Random(seed + thread_index)
+            for step in range(per_thread):
+                if thread_rng.random() < write_ratio:
+                    family.add_member(mother_name=thread_rng.choice(mothers), new_member_gender=Gender.MALE,
+                                      new_member_name=f"thread{round_index}x{thread_index}x{step}")
+                else:
+                    family.get_relationship(member_name=thread_rng.choice(names),
+                                            relation=thread_rng.choice(relations))
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            started = time.perf_counter()
+            list(executor.map(work, range(threads)))
+            return per_thread * threads / (time.perf_counter() - started)
+
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)
+    report = {"members": members, "operations": operations, "write_ratio": write_ratio,
+              "gil_enabled": is_gil_enabled()}
+    baseline = None
+    for threads in range(1, max_threads + 1):
+        operations_per_second = run(threads=threads, round_index=threads)
+        baseline = baseline or operations_per_second
+        report[f"threads.{threads}"] = {"operations_per_second": operations_per_second,
+                                        "speedup": operations_per_second / baseline}
+    return report
+
+
+def person_memory(count: int) -> Dict[str, Dict[str, float]]:
+    report = {}
+    for person_class in (Person, CompactPerson):
+        gc.collect()
+        tracemalloc.start()
+        people = build_people(person_class=person_class, count=count)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        report[person_class.__name__] = {
+            "members": len(people),
+            "bytes": current,
+            "bytes_per_member": current / len(people),
+            "peak_bytes": peak,
+        }
+        del people
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    memory_parser = subparsers.add_parser("person-memory")
+    memory_parser.add_argument("--members", type=int, default=1_000_000)
+
+    snapshot_parser = subparsers.add_parser("snapshot")
+    snapshot_parser.add_argument("--members", type=int, default=1_000_000)
+
+    suite_parser = subparsers.add_parser("suite")
+    suite_parser.add_argument("--members", type=int, default=100_000)
+    suite_parser.add_argument("--fan-out", type=int, default=3)
+    suite_parser.add_argument("--depth", type=int, default=None)
+    suite_parser.add_argument("--samples", type=int, default=10_000)
+    suite_parser.add_argument("--seed", type=int, default=0)
+
+    commands_parser = subparsers.add_parser("commands")
+    commands_parser.add_argument("--members", type=int, default=100_000)
+    commands_parser.add_argument("--commands", type=int, default=1_000_000)
+    commands_parser.add_argument("--seed", type=int, default=0)
+
+    threads_parser = subparsers.add_parser("threads")
+    threads_parser.add_argument("--members", type=int, default=100_000)
+    threads_parser.add_argument("--operations", type=int, default=200_000)
+    threads_parser.add_argument("--max-threads", type=int, default=os.cpu_count() or 1)
+    threads_parser.add_argument("--write-ratio", type=float, default=0.01)
+    threads_parser.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args()
+    if args.benchmark == "commands":
+        report = command_processing(members=args.members, commands=args.commands, seed=args.seed)
+    elif args.benchmark == "suite":
+        report = suite(members=args.members, fan_out=args.fan_out, depth=args.depth, samples=args.samples,
+                       seed=args.seed)
+    elif args.benchmark == "threads":
+        report = thread_scaling(members=args.members, operations=args.operations, max_threads=args.max_threads,
+                                write_ratio=args.write_ratio, seed=args.seed)
+    elif args.benchmark == "person-memory":
+        report = person_memory(count=args.members)
+    elif args.benchmark == "snapshot":
+        report = snapshot_start(count=args.members)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
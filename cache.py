@@ -0,0 +1,46 @@
+import threading
+from collections import OrderedDict
+from enum import Enum
+from typing import Hashable, Iterable, Tuple
+
+MISSING = object()
+
+
+class RelationCache:
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: Tuple[Hashable, Enum]):
+        if self.max_size <= 0:
+            return MISSING
+
+        with self.lock:
+            value = self.entries.get(key, MISSING)
+            if value is not MISSING:
+                self.entries.move_to_end(key)
+            return value
+
+    def put(self, key: Tuple[Hashable, Enum], value):
+        if self.max_size <= 0:
+            return
+
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, keys: Iterable[Tuple[Hashable, Enum]]):
+        with self.lock:
+            for key in keys:
+                self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
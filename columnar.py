@@ -0,0 +1,439 @@
+from __future__ import annotations
+
+from array import array
+from enum import Enum
+from typing import (Callable, Dict, Iterable, List, Optional, Sequence, Tuple,
+                    Union)
+
+from constants import Relations, Responses
+from family import Family, lookup_name
+from lineage import WalkedLineage
+from person import FEMALE_CODE, GENDER_CODES, GENDERS, MALE_CODE, Gender
+from relations import RELATION_CLASS_PICKER
+
+NO_MEMBER = -1
+
+
+class ColumnarMember:
+    __slots__ = ("family", "index")
+
+    def __init__(self, family: ColumnarFamily, index: int):
+        self.family = family
+        self.index = index
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ColumnarMember) and self.family is other.family and self.index == other.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.family), self.index))
+
+    @property
+    def name(self) -> str:
+        return self.family.names[self.index]
+
+    @property
+    def encoded_name(self) -> bytes:
+        return self.family.names[self.index].encode()
+
+    @property
+    def gender(self) -> Enum:
+        return GENDERS[self.family.genders[self.index]]
+
+    @property
+    def mother(self) -> Optional[ColumnarMember]:
+        return self.family.member(index=self.family.mothers[self.index])
+
+    @property
+    def spouse(self) -> Optional[ColumnarMember]:
+        return self.family.member(index=self.family.spouses[self.index])
+
+    @property
+    def children(self) -> List[ColumnarMember]:
+        return [ColumnarMember(self.family, child) for child in self.family.children(index=self.index)]
+
+
+class ColumnarFamily(WalkedLineage):
+
+    def __init__(self):
+        self.names = []
+        self.ids_by_name = {}
+        self.genders = array("b")
+        self.mothers = array("q")
+        self.spouses = array("q")
+        self.child_offsets = array("q", [0])
+        self.child_ids = array("q")
+        self.extra_children = {}
+
+    @classmethod
+    def from_family(cls, family: Family) -> ColumnarFamily:
+        columnar = cls()
+        ids = {}
+        for member in family.members:
+            ids[member] = columnar.__append(name=member.name, gender_code=GENDER_CODES[member.gender])
+
+        for member in family.members:
+            index = ids[member]
+            if member.mother:
+                columnar.mothers[index] = ids[member.mother]
+            if member.spouse:
+                columnar.spouses[index] = ids[member.spouse]
+            if member.gender is Gender.FEMALE and member.children:
+                columnar.extra_children[index] = [ids[child] for child in member.children]
+
+        columnar.compact()
+        return columnar
+
+    def __append(self, name: str, gender_code: int, mother: int = NO_MEMBER) -> int:
+        index = len(self.names)
+        self.names.append(name)
+        self.ids_by_name[name] = index
+        self.genders.append(gender_code)
+        self.mothers.append(mother)
+        self.spouses.append(NO_MEMBER)
+        return index
+
+    def compact(self):
+        total = len(self.names)
+        offsets = array("q", [0])
+        child_ids = array("q")
+        for index in range(total):
+            child_ids.extend(self.__children_of_mother(index=index))
+            offsets.append(len(child_ids))
+
+        self.child_offsets = offsets
+        self.child_ids = child_ids
+        self.extra_children = {}
+
+    @property
+    def total_members(self) -> int:
+        return len(self.names)
+
+    def member(self, index: int) -> Optional[ColumnarMember]:
+        return ColumnarMember(self, index) if index != NO_MEMBER else None
+
+    def member_id(self, person_name: Union[str, bytes]) -> int:
+        return lookup_name(index=self.ids_by_name, person_name=person_name, default=NO_MEMBER)
+
+    def member_exists(self, person_name: Union[str, bytes]) -> Optional[ColumnarMember]:
+        return self.member(index=self.member_id(person_name=person_name))
+
+    def __children_of_mother(self, index: int) -> List[int]:
+        children = []
+        if index + 1 < len(self.child_offsets):
+            children.extend(self.child_ids[self.child_offsets[index]:self.child_offsets[index + 1]])
+        children.extend(self.extra_children.get(index, ()))
+        return children
+
+    def children(self, index: int) -> List[int]:
+        if self.genders[index] == MALE_CODE:
+            index = self.spouses[index]
+            if index == NO_MEMBER:
+                return []
+
+        return self.__children_of_mother(index=index)
+
+    def set_spouse(self, index: int, spouse: int):
+        self.spouses[index] = spouse
+        self.spouses[spouse] = index
+
+    def add_member(self, mother_name: str, new_member_name: str, new_member_gender: Enum) -> Enum:
+        mother = self.member_id(person_name=mother_name)
+        if mother == NO_MEMBER:
+            return Responses.PERSON_NOT_FOUND
+
+        if self.member_id(person_name=new_member_name) != NO_MEMBER:
+            return Responses.CHILD_ADDITION_FAILED
+
+        if self.genders[mother] != FEMALE_CODE or self.spouses[mother] == NO_MEMBER:
+            return Responses.CHILD_ADDITION_FAILED
+
+        child = self.__append(name=new_member_name.capitalize(), gender_code=GENDER_CODES[new_member_gender],
+                              mother=mother)
+        self.extra_children.setdefault(mother, []).append(child)
+        return Responses.CHILD_ADDITION_SUCCEEDED
+
+    def relatives(self, index: int, relation: Enum) -> Union[int, List[int]]:
+        return COLUMNAR_RELATION_PICKER[relation](self, index)
+
+    def get_relationship(self, member_name: str, relation: Enum) -> Optional[Union[Enum, List]]:
+        index = self.member_id(person_name=member_name)
+        if index == NO_MEMBER:
+            return Responses.PERSON_NOT_FOUND
+
+        relatives = self.relatives(index=index, relation=relation)
+        if isinstance(relatives, int):
+            return self.member(index=relatives)
+
+        return [ColumnarMember(self, relative) for relative in relatives] if relatives else None
+
+    def get_relationships(self, queries: Iterable[Tuple[str, Enum]]) -> List[Optional[Union[Enum, List]]]:
+        results = []
+        groups = {}
+        for position, (member_name, relation) in enumerate(queries):
+            index = self.member_id(person_name=member_name)
+            if index == NO_MEMBER:
+                results.append(Responses.PERSON_NOT_FOUND)
+                continue
+
+            results.append(None)
+            positions, indices = groups.setdefault(relation, ([], []))
+            positions.append(position)
+            indices.append(index)
+
+        for relation, (positions, indices) in groups.items():
+            batch_relation = BATCH_RELATION_PICKER.get(relation)
+            if batch_relation:
+                resolved = batch_relation(self, indices)
+            else:
+                relation_of = COLUMNAR_RELATION_PICKER[relation]
+                resolved = [relation_of(self, index) for index in indices]
+
+            for position, relatives in zip(positions, resolved):
+                if isinstance(relatives, int):
+                    results[position] = ColumnarMember(self, relatives) if relatives != NO_MEMBER else None
+                elif relatives:
+                    results[position] = [ColumnarMember(self, relative) for relative in relatives]
+
+        return results
+
+
+def mother_of(family: ColumnarFamily, index: int) -> int:
+    return family.mothers[index]
+
+
+def father_of(family: ColumnarFamily, index: int) -> int:
+    mother = family.mothers[index]
+    if mother == NO_MEMBER:
+        return NO_MEMBER
+
+    return family.spouses[mother]
+
+
+def siblings_of(family: ColumnarFamily, index: int) -> List[int]:
+    mother = family.mothers[index]
+    if mother == NO_MEMBER:
+        return []
+
+    return [child for child in family.children(index=mother) if child != index]
+
+
+def brothers_of(family: ColumnarFamily, index: int) -> List[int]:
+    genders = family.genders
+    return [sibling for sibling in siblings_of(family, index) if genders[sibling] == MALE_CODE]
+
+
+def sisters_of(family: ColumnarFamily, index: int) -> List[int]:
+    genders = family.genders
+    return [sibling for sibling in siblings_of(family, index) if genders[sibling] == FEMALE_CODE]
+
+
+def sons_of(family: ColumnarFamily, index: int) -> List[int]:
+    genders = family.genders
+    return [child for child in family.children(index=index) if genders[child] == MALE_CODE]
+
+
+def daughters_of(family: ColumnarFamily, index: int) -> List[int]:
+    genders = family.genders
+    return [child for child in family.children(index=index) if genders[child] == FEMALE_CODE]
+
+
+def paternal_uncles_of(family: ColumnarFamily, index: int) -> List[int]:
+    father = father_of(family, index)
+    return brothers_of(family, father) if father != NO_MEMBER else []
+
+
+def paternal_aunts_of(family: ColumnarFamily, index: int) -> List[int]:
+    father = father_of(family, index)
+    return sisters_of(family, father) if father != NO_MEMBER else []
+
+
+def maternal_uncles_of(family: ColumnarFamily, index: int) -> List[int]:
+    mother = family.mothers[index]
+    return brothers_of(family, mother) if mother != NO_MEMBER else []
+
+
+def maternal_aunts_of(family: ColumnarFamily, index: int) -> List[int]:
+    mother = family.mothers[index]
+    return sisters_of(family, mother) if mother != NO_MEMBER else []
+
+
+def brothers_in_law_of(family: ColumnarFamily, index: int) -> List[int]:
+    brothers_in_law = []
+
+    spouse = family.spouses[index]
+    if spouse != NO_MEMBER:
+        brothers_in_law.extend(brothers_of(family, spouse))
+
+    spouses = family.spouses
+    brothers_in_law.extend(spouses[sister] for sister in sisters_of(family, index) if spouses[sister] != NO_MEMBER)
+    return brothers_in_law
+
+
+def sisters_in_law_of(family: ColumnarFamily, index: int) -> List[int]:
+    spouses = family.spouses
+    sisters_in_law = [spouses[brother] for brother in brothers_of(family, index) if spouses[brother] != NO_MEMBER]
+
+    spouse = spouses[index]
+    if spouse != NO_MEMBER:
+        sisters_in_law.extend(sisters_of(family, spouse))
+
+    return sisters_in_law
+
+
+def path_relation_of(relation: Enum) -> Callable[[ColumnarFamily, int], List[int]]:
+    relation_of = RELATION_CLASS_PICKER[relation]
+
+    def relatives_of(family: ColumnarFamily, index: int) -> List[int]:
+        return [relative.index for relative in relation_of(ColumnarMember(family, index)).relatives()]
+
+    return relatives_of
+
+
+COLUMNAR_RELATION_PICKER: Dict[Enum, Callable[[ColumnarFamily, int], Union[int, List[int]]]] = {
+    Relations.Mother: mother_of,
+    Relations.Father: father_of,
+    Relations.Siblings: siblings_of,
+    Relations.Brother: brothers_of,
+    Relations.Sister: sisters_of,
+    Relations.Son: sons_of,
+    Relations.Daughter: daughters_of,
+    Relations.BrotherInLaw: brothers_in_law_of,
+    Relations.SisterInLaw: sisters_in_law_of,
+    Relations.MaternalAunt: maternal_aunts_of,
+    Relations.PaternalAunt: paternal_aunts_of,
+    Relations.MaternalUncle: maternal_uncles_of,
+    Relations.PaternalUncle: paternal_uncles_of,
+    Relations.Cousins: path_relation_of(Relations.Cousins),
+    Relations.Grandparents: path_relation_of(Relations.Grandparents),
+    Relations.Grandchildren: path_relation_of(Relations.Grandchildren)
+}
+
+
+def mothers_of(family: ColumnarFamily, indices: Sequence[int]) -> List[int]:
+    mothers = family.mothers
+    return [mothers[index] if index != NO_MEMBER else NO_MEMBER for index in indices]
+
+
+def spouses_of(family: ColumnarFamily, indices: Sequence[int]) -> List[int]:
+    spouses = family.spouses
+    return [spouses[index] if index != NO_MEMBER else NO_MEMBER for index in indices]
+
+
+def fathers_of(family: ColumnarFamily, indices: Sequence[int]) -> List[int]:
+    return spouses_of(family, mothers_of(family, indices))
+
+
+def child_lists_of(family: ColumnarFamily, indices: Sequence[int]) -> List[List[int]]:
+    genders, spouses = family.genders, family.spouses
+    mothers = [spouses[index] if index != NO_MEMBER and genders[index] == MALE_CODE else index for index in indices]
+
+    offsets, child_ids, last = family.child_offsets, family.child_ids, len(family.child_offsets) - 1
+    child_lists = [list(child_ids[offsets[mother]:offsets[mother + 1]]) if NO_MEMBER != mother < last else []
+                   for mother in mothers]
+    extra_children = family.extra_children
+    if extra_children:
+        for child_list, mother in zip(child_lists, mothers):
+            child_list.extend(extra_children.get(mother, ()))
+    return child_lists
+
+
+def with_gender(family: ColumnarFamily, lists: List[List[int]], gender_code: int) -> List[List[int]]:
+    genders = family.genders
+    return [[member for member in members if genders[member] == gender_code] for members in lists]
+
+
+def sibling_lists_of(family: ColumnarFamily, indices: Sequence[int]) -> List[List[int]]:
+    child_lists = child_lists_of(family, mothers_of(family, indices))
+    return [[child for child in children if child != index] for index, children in zip(indices, child_lists)]
+
+
+def brother_lists_of(family: ColumnarFamily, indices: Sequence[int]) -> List[List[int]]:
+    return with_gender(family, sibling_lists_of(family, indices), MALE_CODE)
+
+
+def sister_lists_of(family: ColumnarFamily, indices: Sequence[int]) -> List[List[int]]:
+    return with_gender(family, sibling_lists_of(family, indices), FEMALE_CODE)
+
+
+def son_lists_of(family: ColumnarFamily, indices: Sequence[int]) -> List[List[int]]:
+    return with_gender(family, child_lists_of(family, indices), MALE_CODE)
+
+
+def daughter_lists_of(family: ColumnarFamily, indices: Sequence[int]) -> List[List[int]]:
+    return with_gender(family, child_lists_of(family, indices), FEMALE_CODE)
+
+
+def paternal_uncle_lists_of(family: ColumnarFamily, indices: Sequence[int]) -> List[List[int]]:
+    return brother_lists_of(family, fathers_of(family, indices))
+
+
+def paternal_aunt_lists_of(family: ColumnarFamily, indices: Sequence[int]) -> List[List[int]]:
+    return sister_lists_of(family, fathers_of(family, indices))
+
+
+def maternal_uncle_lists_of(family: ColumnarFamily, indices: Sequence[int]) -> List[List[int]]:
+    return brother_lists_of(family, mothers_of(family, indices))
+
+
+def maternal_aunt_lists_of(family: ColumnarFamily, indices: Sequence[int]) -> List[List[int]]:
+    return sister_lists_of(family, mothers_of(family, indices))
+
+
+def married_spouses(family: ColumnarFamily, lists: List[List[int]]) -> List[List[int]]:
+    spouses = family.spouses
+    return [[spouses[member] for member in members if spouses[member] != NO_MEMBER] for members in lists]
+
+
+def brother_in_law_lists_of(family: ColumnarFamily, indices: Sequence[int]) -> List[List[int]]:
+    spouse_brothers = brother_lists_of(family, spouses_of(family, indices))
+    sister_husbands = married_spouses(family, sister_lists_of(family, indices))
+    return [brothers + husbands for brothers, husbands in zip(spouse_brothers, sister_husbands)]
+
+
+def sister_in_law_lists_of(family: ColumnarFamily, indices: Sequence[int]) -> List[List[int]]:
+    brother_wives = married_spouses(family, brother_lists_of(family, indices))
+    spouse_sisters = sister_lists_of(family, spouses_of(family, indices))
+    return [wives + sisters for wives, sisters in zip(brother_wives, spouse_sisters)]
+
+
+def children_of_lists(family: ColumnarFamily, lists: List[List[int]]) -> List[List[int]]:
+    flat = [member for members in lists for member in members]
+    child_lists = iter(child_lists_of(family, flat))
+    return [[child for _ in members for child in next(child_lists)] for members in lists]
+
+
+def cousin_lists_of(family: ColumnarFamily, indices: Sequence[int]) -> List[List[int]]:
+    maternal = children_of_lists(family, sibling_lists_of(family, mothers_of(family, indices)))
+    paternal = children_of_lists(family, sibling_lists_of(family, fathers_of(family, indices)))
+    return [mother_side + father_side for mother_side, father_side in zip(maternal, paternal)]
+
+
+def grandparent_lists_of(family: ColumnarFamily, indices: Sequence[int]) -> List[List[int]]:
+    maternal = mothers_of(family, mothers_of(family, indices))
+    paternal = mothers_of(family, fathers_of(family, indices))
+    columns = (maternal, spouses_of(family, maternal), paternal, spouses_of(family, paternal))
+    return [[member for member in row if member != NO_MEMBER] for row in zip(*columns)]
+
+
+def grandchild_lists_of(family: ColumnarFamily, indices: Sequence[int]) -> List[List[int]]:
+    return children_of_lists(family, child_lists_of(family, indices))
+
+
+BATCH_RELATION_PICKER: Dict[Enum, Callable[[ColumnarFamily, Sequence[int]], List[Union[int, List[int]]]]] = {
+    Relations.Mother: mothers_of,
+    Relations.Father: fathers_of,
+    Relations.Siblings: sibling_lists_of,
+    Relations.Brother: brother_lists_of,
+    Relations.Sister: sister_lists_of,
+    Relations.Son: son_lists_of,
+    Relations.Daughter: daughter_lists_of,
+    Relations.BrotherInLaw: brother_in_law_lists_of,
+    Relations.SisterInLaw: sister_in_law_lists_of,
+    Relations.MaternalAunt: maternal_aunt_lists_of,
+    Relations.PaternalAunt: paternal_aunt_lists_of,
+    Relations.MaternalUncle: maternal_uncle_lists_of,
+    Relations.PaternalUncle: paternal_uncle_lists_of,
+    Relations.Cousins: cousin_lists_of,
+    Relations.Grandparents: grandparent_lists_of,
+    Relations.Grandchildren: grandchild_lists_of
+}
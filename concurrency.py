@@ -0,0 +1,113 @@
+import threading
+from contextlib import contextmanager
+from enum import Enum
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from family import Family
+from person import Person
+
+
+class ReadWriteLock:
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__condition = threading.Condition(self.__lock)
+        self.__readers = 0
+        self.__writer = False
+        self.__waiting_writers = 0
+
+    def acquire_read(self):
+        with self.__lock:
+            while self.__writer or self.__waiting_writers:
+                self.__condition.wait()
+            self.__readers += 1
+
+    def release_read(self):
+        with self.__lock:
+            self.__readers -= 1
+            if not self.__readers and self.__waiting_writers:
+                self.__condition.notify_all()
+
+    def acquire_write(self):
+        with self.__lock:
+            self.__waiting_writers += 1
+            while self.__writer or self.__readers:
+                self.__condition.wait()
+            self.__waiting_writers -= 1
+            self.__writer = True
+
+    def release_write(self):
+        with self.__lock:
+            self.__writer = False
+            self.__condition.notify_all()
+
+    @contextmanager
+    def reading(self) -> Iterator[None]:
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class ConcurrentFamily:
+
+    def __init__(self, family: Family = None):
+        self.family = family or Family()
+        self.lock = ReadWriteLock()
+
+    @property
+    def total_members(self) -> int:
+        with self.lock.reading():
+            return self.family.total_members
+
+    def member_exists(self, person_name: Union[str, bytes]) -> Optional[Person]:
+        with self.lock.reading():
+            return self.family.member_exists(person_name=person_name)
+
+    def get_relationship(self, member_name: Union[str, bytes], relation: Enum) -> Optional[Union[Enum, List]]:
+        with self.lock.reading():
+            return self.family.get_relationship(member_name=member_name, relation=relation)
+
+    def is_descendant(self, member_name: Union[str, bytes], ancestor_name: Union[str, bytes]) -> Enum:
+        with self.lock.reading():
+            return self.family.is_descendant(member_name=member_name, ancestor_name=ancestor_name)
+
+    def get_generation(self, member_name: Union[str, bytes]) -> Union[Enum, int]:
+        with self.lock.reading():
+            return self.family.get_generation(member_name=member_name)
+
+    def get_common_ancestors(self, member_name: Union[str, bytes],
+                             other_member_name: Union[str, bytes]) -> Optional[Union[Enum, List]]:
+        with self.lock.reading():
+            return self.family.get_common_ancestors(member_name=member_name, other_member_name=other_member_name)
+
+    def add_member(self, mother_name: str, new_member_name: str, new_member_gender: Enum) -> Enum:
+        with self.lock.writing():
+            return self.family.add_member(mother_name=mother_name, new_member_name=new_member_name,
+                                          new_member_gender=new_member_gender)
+
+    def add_members(self, records: Iterable[Tuple[str, str, Enum]]) -> List[Enum]:
+        records = list(records)
+        with self.lock.writing():
+            return self.family.add_members(records=records)
+
+    def add_spouse(self, member_name: str, spouse_name: str, spouse_gender: Enum) -> Optional[Person]:
+        with self.lock.writing():
+            member = self.family.member_exists(person_name=member_name)
+            if not member or member.spouse or self.family.member_exists(person_name=spouse_name):
+                return None
+
+            spouse = self.family.person_class(name=spouse_name, gender=spouse_gender)
+            member.set_spouse(spouse=spouse)
+            self.family.register_member(member=spouse)
+            self.family.relation_cache.clear()
+            return spouse
@@ -5,6 +5,9 @@ class Responses(Enum):
     CHILD_ADDITION_FAILED = "CHILD_ADDITION_FAILED"
     CHILD_ADDITION_SUCCEEDED = "CHILD_ADDITION_SUCCEEDED"
     PERSON_NOT_FOUND = "PERSON_NOT_FOUND"
+    FAMILY_NOT_FOUND = "FAMILY_NOT_FOUND"
+    YES = "YES"
+    NO = "NO"
 
 
 class Relations(Enum):
@@ -21,8 +24,14 @@ class Relations(Enum):
     PaternalAunt = "Paternal-Aunt"
     MaternalUncle = "Maternal-Uncle"
     PaternalUncle = "Paternal-Uncle"
+    Cousins = "Cousins"
+    Grandparents = "Grandparents"
+    Grandchildren = "Grandchildren"
 
 
 class Operations(Enum):
     ADD_CHILD = "ADD_CHILD"
     GET_RELATIONSHIP = "GET_RELATIONSHIP"
+    IS_DESCENDANT = "IS_DESCENDANT"
+    GET_GENERATION = "GET_GENERATION"
+    GET_COMMON_ANCESTOR = "GET_COMMON_ANCESTOR"
@@ -1,120 +1,299 @@
+import gc
+import sys
 from enum import Enum
-from typing import List, Optional, Union
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-from constants import Responses
+from cache import MISSING, RelationCache
+from constants import Relations, Responses
+from lineage import LineageIndex
 from person import Gender, Person
-from relations import RELATION_CLASS_PICKER
+from relations import RELATION_CLASS_PICKER, RELATION_PICKERS
+
+BULK_BATCH_SIZE = 100_000
+
+
+def lookup_name(index: Dict[Union[str, bytes], object], person_name: Union[str, bytes], default=None):
+    entry = index.get(person_name)
+    if entry is None:
+        name = person_name.decode() if isinstance(person_name, bytes) else person_name
+        entry = index.get(name.capitalize(), default)
+    return entry
 
 
 class Family:
 
-    def __init__(self):
+    def __init__(self, relation_cache_size: int = 0, person_class: type = Person):
+        self.person_class = person_class
+        self.relation_picker = RELATION_PICKERS.get(person_class, RELATION_CLASS_PICKER)
         self.members = []
+        self.members_by_name = {}
+        self.relation_cache = RelationCache(max_size=relation_cache_size)
+        self.lineage = LineageIndex()
         self.__initialize_family()
 
     def __initialize_family(self):
-        shan = Person(name="shan", gender=Gender.MALE)
-        anga = Person(name="anga", gender=Gender.FEMALE)
+        shan = self.person_class(name="shan", gender=Gender.MALE)
+        anga = self.person_class(name="anga", gender=Gender.FEMALE)
         anga.set_spouse(spouse=shan)
 
-        chit = Person(name="chit", gender=Gender.MALE)
-        ish = Person(name="ish", gender=Gender.MALE)
-        vich = Person(name="vich", gender=Gender.MALE)
-        aras = Person(name="aras", gender=Gender.MALE)
-        satya = Person(name="satya", gender=Gender.FEMALE)
+        chit = self.person_class(name="chit", gender=Gender.MALE)
+        ish = self.person_class(name="ish", gender=Gender.MALE)
+        vich = self.person_class(name="vich", gender=Gender.MALE)
+        aras = self.person_class(name="aras", gender=Gender.MALE)
+        satya = self.person_class(name="satya", gender=Gender.FEMALE)
         anga.add_children(children=[chit, ish, vich, aras, satya])
 
-        amba = Person(name="amba", gender=Gender.FEMALE)
-        lika = Person(name="lika", gender=Gender.FEMALE)
-        chitra = Person(name="chitra", gender=Gender.FEMALE)
-        vyan = Person(name="vyan", gender=Gender.MALE)
+        amba = self.person_class(name="amba", gender=Gender.FEMALE)
+        lika = self.person_class(name="lika", gender=Gender.FEMALE)
+        chitra = self.person_class(name="chitra", gender=Gender.FEMALE)
+        vyan = self.person_class(name="vyan", gender=Gender.MALE)
 
         amba.set_spouse(spouse=chit)
         lika.set_spouse(spouse=vich)
         chitra.set_spouse(spouse=aras)
         satya.set_spouse(spouse=vyan)
 
-        dritha = Person(name="dritha", gender=Gender.FEMALE)
-        tritha = Person(name="tritha", gender=Gender.FEMALE)
-        vritha = Person(name="vritha", gender=Gender.MALE)
+        dritha = self.person_class(name="dritha", gender=Gender.FEMALE)
+        tritha = self.person_class(name="tritha", gender=Gender.FEMALE)
+        vritha = self.person_class(name="vritha", gender=Gender.MALE)
         amba.add_children(children=[dritha, tritha, vritha])
 
-        jaya = Person(name="jaya", gender=Gender.MALE)
+        jaya = self.person_class(name="jaya", gender=Gender.MALE)
         dritha.set_spouse(spouse=jaya)
 
-        yodhan = Person(name="yodhan", gender=Gender.MALE)
+        yodhan = self.person_class(name="yodhan", gender=Gender.MALE)
         dritha.add_child(child=yodhan)
 
-        vila = Person(name="vila", gender=Gender.FEMALE)
-        chika = Person(name="chika", gender=Gender.FEMALE)
+        vila = self.person_class(name="vila", gender=Gender.FEMALE)
+        chika = self.person_class(name="chika", gender=Gender.FEMALE)
         lika.add_children(children=[vila, chika])
 
-        jnki = Person(name="jnki", gender=Gender.FEMALE)
-        ahit = Person(name="ahit", gender=Gender.MALE)
+        jnki = self.person_class(name="jnki", gender=Gender.FEMALE)
+        ahit = self.person_class(name="ahit", gender=Gender.MALE)
         chitra.add_children(children=[jnki, ahit])
 
-        arit = Person(name="arit", gender=Gender.MALE)
+        arit = self.person_class(name="arit", gender=Gender.MALE)
         jnki.set_spouse(spouse=arit)
 
-        laki = Person(name="laki", gender=Gender.MALE)
-        lavnya = Person(name="lavnya", gender=Gender.FEMALE)
+        laki = self.person_class(name="laki", gender=Gender.MALE)
+        lavnya = self.person_class(name="lavnya", gender=Gender.FEMALE)
         jnki.add_children(children=[laki, lavnya])
 
-        asva = Person(name="asva", gender=Gender.MALE)
-        vyas = Person(name="vyas", gender=Gender.MALE)
-        atya = Person(name="atya", gender=Gender.FEMALE)
+        asva = self.person_class(name="asva", gender=Gender.MALE)
+        vyas = self.person_class(name="vyas", gender=Gender.MALE)
+        atya = self.person_class(name="atya", gender=Gender.FEMALE)
         satya.add_children(children=[asva, vyas, atya])
 
-        satvy = Person(name="satvy", gender=Gender.FEMALE)
-        krpi = Person(name="krpi", gender=Gender.FEMALE)
+        satvy = self.person_class(name="satvy", gender=Gender.FEMALE)
+        krpi = self.person_class(name="krpi", gender=Gender.FEMALE)
 
         satvy.set_spouse(spouse=asva)
         krpi.set_spouse(spouse=vyas)
 
-        vasa = Person(name="vasa", gender=Gender.MALE)
+        vasa = self.person_class(name="vasa", gender=Gender.MALE)
         satvy.add_child(child=vasa)
 
-        kriya = Person(name="kriya", gender=Gender.MALE)
-        krithi = Person(name="krithi", gender=Gender.FEMALE)
+        kriya = self.person_class(name="kriya", gender=Gender.MALE)
+        krithi = self.person_class(name="krithi", gender=Gender.FEMALE)
         krpi.add_children(children=[kriya, krithi])
 
-        self.members = [
+        members = [
             shan, anga,
             chit, amba, ish, vich, lika, aras, chitra, satya, vyan,
             dritha, tritha, vritha, jaya, vila, chika, arit, jnki, ahit, satvy, asva, krpi, vyas, atya,
             yodhan, laki, lavnya, vasa, kriya, krithi
         ]
+        for member in members:
+            self.register_member(member=member)
+
+    def register_member(self, member: Person):
+        member.name = sys.intern(member.name)
+        self.members.append(member)
+        self.members_by_name[member.name] = self.members_by_name[member.encoded_name] = member
+        self.lineage.add(person=member)
 
     @property
     def total_members(self) -> int:
         return len(self.members)
 
-    def member_exists(self, person_name: str) -> Optional[Person]:
-        matched_member = None
-        for member in self.members:
-            if member.name == person_name.capitalize():
-                matched_member = member
-                break
-
-        return matched_member
+    def member_exists(self, person_name: Union[str, bytes]) -> Optional[Person]:
+        member = self.members_by_name.get(person_name)
+        return member if member is not None else lookup_name(index=self.members_by_name, person_name=person_name)
 
     def add_member(self, mother_name: str, new_member_name: str, new_member_gender: Enum) -> Enum:
         mother = self.member_exists(person_name=mother_name)
         if not mother:
             return Responses.PERSON_NOT_FOUND
 
-        child = Person(name=new_member_name, gender=new_member_gender)
+        if self.member_exists(person_name=new_member_name):
+            return Responses.CHILD_ADDITION_FAILED
+
+        child = self.person_class(name=new_member_name, gender=new_member_gender)
         status = mother.add_child(child=child)
         if status == Responses.CHILD_ADDITION_SUCCEEDED:
-            self.members.append(child)
+            self.register_member(member=child)
+            if len(self.relation_cache):
+                self.relation_cache.invalidate(keys=self.__relations_changed_by(child=child))
 
         return status
 
-    def get_relationship(self, member_name: str, relation: Enum) -> Optional[Union[Enum, List]]:
+    def add_members(self, records: Iterable[Tuple[str, str, Enum]],
+                    batch_size: int = BULK_BATCH_SIZE) -> List[Enum]:
+        statuses = []
+        records = iter(records)
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            while True:
+                batch = list(islice(records, batch_size))
+                if not batch:
+                    return statuses
+
+                statuses.extend(self.__add_batch(records=batch))
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def __add_batch(self, records: List[Tuple[str, str, Enum]]) -> List[Enum]:
+        statuses = []
+        new_members = {}
+        children_by_mother = {}
+        for mother_name, new_member_name, new_member_gender in records:
+            mother_name = mother_name.capitalize()
+            mother = self.members_by_name.get(mother_name) or new_members.get(mother_name)
+            if not mother:
+                statuses.append(Responses.PERSON_NOT_FOUND)
+                continue
+
+            child = self.person_class(name=new_member_name, gender=new_member_gender)
+            if child.name in self.members_by_name or child.name in new_members or \
+                    mother.gender is not Gender.FEMALE or mother.spouse is None:
+                statuses.append(Responses.CHILD_ADDITION_FAILED)
+                continue
+
+            child.name = sys.intern(child.name)
+            new_members[child.name] = child
+            children_by_mother.setdefault(mother, []).append(child)
+            statuses.append(Responses.CHILD_ADDITION_SUCCEEDED)
+
+        for mother, children in children_by_mother.items():
+            mother.add_children(children=children)
+            self.lineage.add_children(mother=mother, children=children)
+
+        self.members.extend(new_members.values())
+        for child in new_members.values():
+            self.members_by_name[child.name] = self.members_by_name[child.encoded_name] = child
+        if new_members:
+            self.relation_cache.clear()
+
+        return statuses
+
+    @staticmethod
+    def __relations_changed_by(child: Person) -> Iterator[Tuple[Person, Enum]]:
+        mother = child.mother
+        yield mother, Relations.Son
+        yield mother, Relations.Daughter
+        if mother.spouse:
+            yield mother.spouse, Relations.Son
+            yield mother.spouse, Relations.Daughter
+
+        is_male = child.gender is Gender.MALE
+        for sibling in mother.children:
+            if sibling is child:
+                continue
+
+            yield sibling, Relations.Siblings
+            yield sibling, Relations.Brother if is_male else Relations.Sister
+
+            if sibling.spouse:
+                yield sibling.spouse, Relations.BrotherInLaw if is_male else Relations.SisterInLaw
+
+            if sibling.gender is Gender.FEMALE:
+                uncle_or_aunt = Relations.MaternalUncle if is_male else Relations.MaternalAunt
+            else:
+                uncle_or_aunt = Relations.PaternalUncle if is_male else Relations.PaternalAunt
+            for nephew_or_niece in sibling.children:
+                yield nephew_or_niece, uncle_or_aunt
+
+        for parent in (mother, mother.spouse):
+            if not parent or not parent.mother:
+                continue
+
+            grandmother = parent.mother
+            yield grandmother, Relations.Grandchildren
+            if grandmother.spouse:
+                yield grandmother.spouse, Relations.Grandchildren
+
+            for aunt_or_uncle in grandmother.children:
+                if aunt_or_uncle is parent:
+                    continue
+
+                for cousin in aunt_or_uncle.children:
+                    yield cousin, Relations.Cousins
+
+    def get_relationship(self, member_name: str, relation: Enum, lazy: bool = False,
+                         limit: Optional[int] = None) -> Optional[Union[Enum, List, Iterator]]:
         member = self.member_exists(person_name=member_name)
         if not member:
             return Responses.PERSON_NOT_FOUND
 
-        relation_of = RELATION_CLASS_PICKER.get(relation)
+        if lazy or limit is not None:
+            relatives = self.__iter_relationship(member=member, relation=relation)
+            if limit is not None:
+                relatives = islice(relatives, limit)
+            if lazy:
+                return relatives
+
+            relatives = list(relatives)
+            return relatives if relatives else None
+
+        cached = self.relation_cache.get(key=(member, relation))
+        if cached is not MISSING:
+            return list(cached) if isinstance(cached, tuple) else cached
+
+        relation_of = self.relation_picker.get(relation)
         relatives = relation_of(member).relatives()
-        return relatives if relatives else None
+        if not relatives:
+            relatives = None
+
+        if self.relation_cache.max_size > 0:
+            frozen = tuple(relatives) if isinstance(relatives, list) else relatives
+            self.relation_cache.put(key=(member, relation), value=frozen)
+        return relatives
+
+    def is_descendant(self, member_name: str, ancestor_name: str) -> Enum:
+        member = self.member_exists(person_name=member_name)
+        ancestor = self.member_exists(person_name=ancestor_name)
+        if not member or not ancestor:
+            return Responses.PERSON_NOT_FOUND
+
+        return Responses.YES if self.lineage.is_descendant(person=member, ancestor=ancestor) else Responses.NO
+
+    def get_generation(self, member_name: str) -> Union[Enum, int]:
+        member = self.member_exists(person_name=member_name)
+        if not member:
+            return Responses.PERSON_NOT_FOUND
+
+        return self.lineage.generation(person=member)
+
+    def get_common_ancestors(self, member_name: str, other_member_name: str) -> Optional[Union[Enum, List]]:
+        member = self.member_exists(person_name=member_name)
+        other_member = self.member_exists(person_name=other_member_name)
+        if not member or not other_member:
+            return Responses.PERSON_NOT_FOUND
+
+        ancestor = self.lineage.common_ancestor(person=member, other=other_member)
+        if not ancestor:
+            return None
+
+        return [ancestor, ancestor.spouse] if ancestor.spouse else [ancestor]
+
+    def __iter_relationship(self, member: Person, relation: Enum) -> Iterator[Person]:
+        cached = self.relation_cache.get(key=(member, relation))
+        if cached is MISSING:
+            return self.relation_picker.get(relation)(member).iter_relatives()
+
+        if cached is None:
+            return iter(())
+        return iter(cached) if isinstance(cached, tuple) else iter((cached,))
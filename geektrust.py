@@ -1,46 +1,153 @@
+import os
 import sys
 from enum import Enum
+from typing import IO, BinaryIO, Callable, Dict, Iterable, List, Union
 
-from constants import Operations, Relations
+from constants import Operations, Relations, Responses
 from family import Family
+from instrumentation import Instrumentation
 from person import Gender
+from snapshot import load_snapshot
 
+OUTPUT_BUFFER_SIZE = 1 << 20
 
-def show(output):
-    if not output:
-        print(None)
+RELATIONS_BY_TOKEN = {token: relation for relation in Relations for token in (relation.value, relation.value.encode())}
+GENDERS_BY_TOKEN = {token: gender for gender in Gender for token in (gender.value, gender.value.encode())}
+ENCODED_RESPONSES = {response: (response.value + "\n").encode() for response in Responses}
+ENCODED_NONE = b"None\n"
+
+
+def render(output) -> str:
+    if isinstance(output, int):
+        return f"{output}\n"
+
+    elif not output:
+        return "None\n"
 
     elif isinstance(output, Enum):
-        print(output.value)
+        return output.value + "\n"
 
     elif isinstance(output, list):
-        for person in output:
-            print(person.name, end=' ')
-        print()
+        return "".join(person.name + " " for person in output) + "\n"
 
+    return output.name + " \n"
 
-def main():
-    input_file = sys.argv[1]
 
-    with open(input_file) as file:
-        lines = file.readlines()
+def show(output, stream: IO[str] = None):
+    (stream or sys.stdout).write(render(output))
+
+
+def render_bytes(output) -> bytes:
+    if output.__class__ is list:
+        return b" ".join([person.encoded_name for person in output]) + b" \n" if output else ENCODED_NONE
+
+    elif output is None:
+        return ENCODED_NONE
+
+    elif isinstance(output, Enum):
+        return ENCODED_RESPONSES[output]
+
+    elif isinstance(output, int):
+        return b"%d\n" % output
+
+    return output.encoded_name + b" \n"
+
+
+def _text(word: Union[str, bytes]) -> str:
+    return word.decode() if word.__class__ is bytes else word
+
+
+def _add_child(family: Family, words: List[Union[str, bytes]]):
+    return family.add_member(mother_name=_text(words[1]),
+                             new_member_name=_text(words[2]),
+                             new_member_gender=GENDERS_BY_TOKEN[words[3]])
+
+
+def _get_relationship(family: Family, words: List[Union[str, bytes]]):
+    return family.get_relationship(member_name=words[1], relation=RELATIONS_BY_TOKEN[words[2]])
+
+
+def _is_descendant(family: Family, words: List[Union[str, bytes]]):
+    return family.is_descendant(member_name=words[1], ancestor_name=words[2])
+
+
+def _get_generation(family: Family, words: List[Union[str, bytes]]):
+    return family.get_generation(member_name=words[1])
+
 
-    family = Family()
+def _get_common_ancestor(family: Family, words: List[Union[str, bytes]]):
+    return family.get_common_ancestors(member_name=words[1], other_member_name=words[2])
+
+
+def _unknown_operation(family: Family, words: List[Union[str, bytes]]):
+    return None
+
+
+TEXT_OPERATION_HANDLERS: Dict[str, Callable[[Family, List[Union[str, bytes]]], object]] = {
+    Operations.ADD_CHILD.value: _add_child,
+    Operations.GET_RELATIONSHIP.value: _get_relationship,
+    Operations.IS_DESCENDANT.value: _is_descendant,
+    Operations.GET_GENERATION.value: _get_generation,
+    Operations.GET_COMMON_ANCESTOR.value: _get_common_ancestor,
+}
+
+OPERATION_HANDLERS: Dict[bytes, Callable[[Family, List[Union[str, bytes]]], object]] = {
+    operation.encode(): handler for operation, handler in TEXT_OPERATION_HANDLERS.items()
+}
+
+
+def execute(family: Family, words: List[str]):
+    return TEXT_OPERATION_HANDLERS.get(words[0], _unknown_operation)(family, words)
+
+
+def process_bytes(lines: Iterable[bytes], family: Family, stream: BinaryIO, instrumentation: Instrumentation = None):
+    handlers = OPERATION_HANDLERS
+    if instrumentation:
+        handlers = {operation: instrumentation.wrap(handler) for operation, handler in handlers.items()}
+
+    write = stream.write
+    for line in lines:
+        words = line.split()
+        if not words:
+            continue
+
+        write(render_bytes(handlers.get(words[0], _unknown_operation)(family, words)))
+
+
+def process(lines: Iterable[str], family: Family, stream: IO[str], instrumentation: Instrumentation = None):
+    execute_command = instrumentation.wrap(execute) if instrumentation else execute
     for line in lines:
-        line = line.rstrip()
         words = line.split()
+        if not words:
+            continue
+
+        show(execute_command(family=family, words=words), stream=stream)
+
+
+def main():
+    input_file = sys.argv[1]
+
+    family = load_snapshot(path=sys.argv[2]) if len(sys.argv) > 2 else Family()
+
+    instrumentation = None
+    report_path = os.environ.get("GEEKTRUST_INSTRUMENT")
+    if report_path:
+        instrumentation = Instrumentation()
+        instrumentation.attach(family=family)
+        instrumentation.install_signal_handler()
 
-        output = None
-        if words[0] == Operations.ADD_CHILD.value:
-            output = family.add_member(mother_name=words[1],
-                                       new_member_name=words[2],
-                                       new_member_gender=Gender(words[3]))
+    with open(input_file, "rb") as file, \
+            open(sys.stdout.fileno(), "wb", buffering=OUTPUT_BUFFER_SIZE, closefd=False) as stream:
+        process_bytes(lines=file, family=family, stream=stream, instrumentation=instrumentation)
 
-        elif words[0] == Operations.GET_RELATIONSHIP.value:
-            output = family.get_relationship(member_name=words[1],
-                                             relation=Relations(words[2]))
+    if not instrumentation:
+        return
 
-        show(output)
+    if report_path == "-":
+        instrumentation.dump(stream=sys.stderr)
+    else:
+        with open(report_path, "w") as report:
+            instrumentation.dump(stream=report)
 
 
 if __name__ == "__main__":
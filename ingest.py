@@ -0,0 +1,57 @@
+import argparse
+import csv
+import json
+import sys
+from collections import Counter
+from typing import IO, Iterator, Tuple
+
+from family import Family
+from person import Gender
+
+CSV_HEADER = ["mother", "child", "gender"]
+
+
+def read_csv_records(file: IO[str]) -> Iterator[Tuple[str, str, Gender]]:
+    for row in csv.reader(file):
+        if not row or row == CSV_HEADER:
+            continue
+
+        mother_name, new_member_name, gender = row
+        yield mother_name, new_member_name, Gender(gender)
+
+
+def read_jsonl_records(file: IO[str]) -> Iterator[Tuple[str, str, Gender]]:
+    for line in file:
+        if not line.strip():
+            continue
+
+        record = json.loads(line)
+        yield record["mother"], record["child"], Gender(record["gender"])
+
+
+RECORD_READERS = {
+    "csv": read_csv_records,
+    "jsonl": read_jsonl_records,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("records_file")
+    parser.add_argument("--format", choices=sorted(RECORD_READERS), default=None)
+    parser.add_argument("--summary", action="store_true")
+    args = parser.parse_args()
+
+    record_format = args.format or ("jsonl" if args.records_file.endswith(".jsonl") else "csv")
+    family = Family()
+    with open(args.records_file, newline="") as file:
+        statuses = family.add_members(records=RECORD_READERS[record_format](file))
+
+    if args.summary:
+        print(json.dumps({status.value: total for status, total in Counter(statuses).items()}))
+    else:
+        sys.stdout.write("".join(status.value + "\n" for status in statuses))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import json
+import signal
+import sys
+import time
+from collections import defaultdict
+from enum import Enum
+from typing import IO, Callable, Dict, List, Union
+
+from constants import Operations
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+class Histogram:
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.maximum = 0
+        self.buckets = defaultdict(int)
+
+    def record(self, value: int):
+        self.count += 1
+        self.total += value
+        if value > self.maximum:
+            self.maximum = value
+        self.buckets[value.bit_length()] += 1
+
+    def percentile(self, fraction: float) -> int:
+        rank = fraction * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min((1 << bucket) - 1, self.maximum)
+        return self.maximum
+
+    def report(self) -> Dict:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0,
+            "p50": self.percentile(0.50),
+            "p99": self.percentile(0.99),
+            "max": self.maximum,
+            "buckets": {f"<{1 << bucket}": total for bucket, total in sorted(self.buckets.items())},
+        }
+
+
+class Instrumentation:
+
+    def __init__(self):
+        self.latencies = defaultdict(Histogram)
+        self.result_sizes = defaultdict(Histogram)
+        self.lookups = Histogram()
+
+    def attach(self, family):
+        member_exists = family.member_exists
+        lookups = self.lookups
+        clock = time.perf_counter_ns
+
+        def timed_member_exists(person_name: str):
+            started = clock()
+            member = member_exists(person_name)
+            lookups.record(clock() - started)
+            return member
+
+        family.member_exists = timed_member_exists
+
+    def wrap(self, execute: Callable) -> Callable:
+        latencies, result_sizes = self.latencies, self.result_sizes
+        clock = time.perf_counter_ns
+
+        def timed_execute(family, words: List[Union[str, bytes]]):
+            started = clock()
+            output = execute(family=family, words=words)
+            elapsed = clock() - started
+
+            operation = words[0].decode() if words[0].__class__ is bytes else words[0]
+            key = f"{operation} {words[2].decode() if words[2].__class__ is bytes else words[2]}" \
+                if operation == Operations.GET_RELATIONSHIP.value and len(words) > 2 else operation
+            latencies[key].record(elapsed)
+            if isinstance(output, list):
+                result_sizes[key].record(len(output))
+            else:
+                result_sizes[key].record(0 if output is None or isinstance(output, Enum) else 1)
+            return output
+
+        return timed_execute
+
+    def report(self) -> Dict:
+        return {
+            "commands": {key: {"latency_ns": histogram.report(), "result_size": self.result_sizes[key].report()}
+                         for key, histogram in sorted(self.latencies.items())},
+            "member_lookup_ns": self.lookups.report(),
+        }
+
+    def dump(self, stream: IO[str]):
+        stream.write(json.dumps(self.report(), indent=2) + "\n")
+        stream.flush()
+
+    def install_signal_handler(self, signum: int = getattr(signal, "SIGUSR1", None), stream: IO[str] = sys.stderr):
+        if signum is not None:
+            signal.signal(signum, lambda *_: self.dump(stream=stream))
@@ -0,0 +1,144 @@
+from enum import Enum
+from typing import Dict, List, Optional, Union
+
+from constants import Responses
+from person import Gender, Person
+
+
+class LineageIndex:
+
+    def __init__(self):
+        self.depths: Dict[Person, int] = {}
+        self.jumps: Dict[Person, List[Person]] = {}
+
+    @staticmethod
+    def node(person: Person) -> Person:
+        if person.mother is not None:
+            return person
+
+        spouse = person.spouse
+        if spouse is None:
+            return person
+
+        if spouse.mother is not None:
+            return spouse
+        return person if person.gender is Gender.FEMALE else spouse
+
+    def parent(self, node: Person) -> Optional[Person]:
+        jumps = self.jumps[node]
+        return jumps[0] if jumps else None
+
+    def add(self, person: Person):
+        pending = []
+        node = self.node(person=person)
+        while node not in self.depths:
+            pending.append(node)
+            if node.mother is None:
+                break
+            node = self.node(person=node.mother)
+
+        for node in reversed(pending):
+            if node.mother is None:
+                self.depths[node] = 0
+                self.jumps[node] = []
+                continue
+
+            parent = self.node(person=node.mother)
+            self.depths[node] = self.depths[parent] + 1
+            self.jumps[node] = self.__jumps_below(parent=parent)
+
+    def add_children(self, mother: Person, children: List[Person]):
+        self.add(person=mother)
+        parent = self.node(person=mother)
+        depth = self.depths[parent] + 1
+        jumps = self.__jumps_below(parent=parent)
+        for child in children:
+            self.depths[child] = depth
+            self.jumps[child] = jumps
+
+    def __jumps_below(self, parent: Person) -> List[Person]:
+        jumps = [parent]
+        while len(self.jumps[jumps[-1]]) >= len(jumps):
+            jumps.append(self.jumps[jumps[-1]][len(jumps) - 1])
+        return jumps
+
+    def generation(self, person: Person) -> int:
+        return self.depths[self.node(person=person)]
+
+    def __lift(self, node: Person, depth: int) -> Person:
+        steps = self.depths[node] - depth
+        level = 0
+        while steps:
+            if steps & 1:
+                node = self.jumps[node][level]
+            steps >>= 1
+            level += 1
+        return node
+
+    def is_descendant(self, person: Person, ancestor: Person) -> bool:
+        if person.mother is None:
+            return False
+
+        node, ancestor_node = person, self.node(person=ancestor)
+        ancestor_depth = self.depths[ancestor_node]
+        if self.depths[node] <= ancestor_depth:
+            return False
+
+        return self.__lift(node=node, depth=ancestor_depth) is ancestor_node
+
+    def common_ancestor(self, person: Person, other: Person) -> Optional[Person]:
+        node, other_node = self.node(person=person), self.node(person=other)
+        depth = min(self.depths[node], self.depths[other_node])
+        node = self.__lift(node=node, depth=depth)
+        other_node = self.__lift(node=other_node, depth=depth)
+        if node is other_node:
+            return node
+
+        for level in reversed(range(len(self.jumps[node]))):
+            jumps, other_jumps = self.jumps[node], self.jumps[other_node]
+            if level < len(jumps) and jumps[level] is not other_jumps[level]:
+                node, other_node = jumps[level], other_jumps[level]
+
+        parent = self.parent(node=node)
+        return parent if parent is not None and parent is self.parent(node=other_node) else None
+
+
+def ancestor_nodes(person) -> list:
+    nodes = [LineageIndex.node(person=person)]
+    while nodes[-1].mother is not None:
+        nodes.append(LineageIndex.node(person=nodes[-1].mother))
+    return nodes
+
+
+class WalkedLineage:
+
+    def is_descendant(self, member_name: str, ancestor_name: str) -> Enum:
+        member = self.member_exists(person_name=member_name)
+        ancestor = self.member_exists(person_name=ancestor_name)
+        if not member or not ancestor:
+            return Responses.PERSON_NOT_FOUND
+
+        if member.mother is None:
+            return Responses.NO
+        return Responses.YES if LineageIndex.node(person=ancestor) in ancestor_nodes(person=member)[1:] else \
+            Responses.NO
+
+    def get_generation(self, member_name: str) -> Union[Enum, int]:
+        member = self.member_exists(person_name=member_name)
+        if not member:
+            return Responses.PERSON_NOT_FOUND
+
+        return len(ancestor_nodes(person=member)) - 1
+
+    def get_common_ancestors(self, member_name: str, other_member_name: str) -> Optional[Union[Enum, List]]:
+        member = self.member_exists(person_name=member_name)
+        other_member = self.member_exists(person_name=other_member_name)
+        if not member or not other_member:
+            return Responses.PERSON_NOT_FOUND
+
+        other_nodes = set(ancestor_nodes(person=other_member))
+        ancestor = next((node for node in ancestor_nodes(person=member) if node in other_nodes), None)
+        if ancestor is None:
+            return None
+
+        return [ancestor, ancestor.spouse] if ancestor.spouse else [ancestor]
@@ -0,0 +1,110 @@
+import argparse
+import os
+import sys
+import tempfile
+from collections import deque
+from multiprocessing import Pool
+from typing import IO, Iterable
+
+from constants import Operations
+from family import Family
+from geektrust import OUTPUT_BUFFER_SIZE, execute, render
+from snapshot import load_snapshot, save_snapshot
+
+DEFAULT_CHUNK_SIZE = 2_000
+MAX_PENDING_CHUNKS = 64
+MIN_POOL_CHUNK_SIZE = 32
+
+_replica = None
+_mutation_log = None
+_applied_mutations = 0
+
+
+def _initialize_worker(snapshot_path: str, mutation_log_path: str):
+    global _replica, _mutation_log, _applied_mutations
+    _replica = load_snapshot(path=snapshot_path)
+    _mutation_log = open(mutation_log_path)
+    _applied_mutations = 0
+
+
+def _resolve(task) -> str:
+    global _applied_mutations
+    mutations, lines = task
+    while _applied_mutations < mutations:
+        execute(family=_replica, words=_mutation_log.readline().split())
+        _applied_mutations += 1
+
+    return "".join(render(execute(family=_replica, words=line.split())) for line in lines)
+
+
+def process_parallel(lines: Iterable[str], family: Family, stream: IO[str], workers: int = None,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE):
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = os.path.join(directory, "family.snapshot")
+        mutation_log_path = os.path.join(directory, "mutations.log")
+        save_snapshot(family=family, path=snapshot_path)
+
+        with open(mutation_log_path, "w") as mutation_log, \
+                Pool(processes=workers, initializer=_initialize_worker,
+                     initargs=(snapshot_path, mutation_log_path)) as pool:
+            mutations = 0
+            chunk = []
+            pending = deque()
+
+            def drain(limit: int):
+                while pending and (len(pending) > limit or isinstance(pending[0], str) or pending[0].ready()):
+                    output = pending.popleft()
+                    stream.write(output if isinstance(output, str) else output.get())
+
+            def submit():
+                mutation_log.flush()
+                pending.append(pool.apply_async(_resolve, ((mutations, chunk),)))
+                drain(limit=MAX_PENDING_CHUNKS)
+
+            def resolve_locally():
+                pending.append("".join(render(execute(family=family, words=line.split())) for line in chunk))
+                drain(limit=MAX_PENDING_CHUNKS)
+
+            for line in lines:
+                words = line.split()
+                if not words:
+                    continue
+
+                if words[0] == Operations.GET_RELATIONSHIP.value:
+                    chunk.append(line)
+                    if len(chunk) >= chunk_size:
+                        submit()
+                        chunk = []
+                    continue
+
+                if len(chunk) >= MIN_POOL_CHUNK_SIZE:
+                    submit()
+                elif chunk:
+                    resolve_locally()
+                chunk = []
+                pending.append(render(execute(family=family, words=words)))
+                drain(limit=MAX_PENDING_CHUNKS)
+                if words[0] == Operations.ADD_CHILD.value:
+                    mutation_log.write(" ".join(words) + "\n")
+                    mutations += 1
+
+            if chunk:
+                resolve_locally()
+            drain(limit=0)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("input_file")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    family = Family()
+    with open(args.input_file) as file, \
+            open(sys.stdout.fileno(), "w", buffering=OUTPUT_BUFFER_SIZE, closefd=False) as stream:
+        process_parallel(lines=file, family=family, stream=stream, workers=args.workers, chunk_size=args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from itertools import chain, count
+from typing import List, Tuple, Union
+
+from person import Gender
+
+
+class Step:
+
+    def __init__(self, name: str, template: List[str], single: bool):
+        self.name = name
+        self.template = template
+        self.single = single
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+mother = Step(name="mother", template=["{out} = {inp}.mother", "if {out} is not None:"], single=True)
+spouse = Step(name="spouse", template=["{out} = {inp}.spouse", "if {out} is not None:"], single=True)
+children = Step(name="children", template=["for {out} in {inp}.children:"], single=False)
+siblings = Step(name="siblings", template=["{tmp} = {inp}.mother", "if {tmp} is not None:",
+                                           "for {out} in {tmp}.children:", "if {out} != {inp}:"], single=False)
+male = Step(name="male", template=["{out} = {inp}", "if {out}.gender is MALE:"], single=True)
+female = Step(name="female", template=["{out} = {inp}", "if {out}.gender is FEMALE:"], single=True)
+
+LEAF_ACTIONS = {"all": "append({var})", "first": "return {var}", "iter": "yield {var}"}
+PLAN_GLOBALS = {"MALE": Gender.MALE, "FEMALE": Gender.FEMALE}
+
+
+class Plan:
+
+    def __init__(self, branches: List[Tuple[Step, ...]]):
+        self.branches = branches
+        self.sources = {mode: self.__generate(mode=mode) for mode in LEAF_ACTIONS}
+
+        namespace = {}
+        for mode, source in self.sources.items():
+            exec(compile(source, f"<plan {self} {mode}>", "exec"), dict(PLAN_GLOBALS), namespace)
+            setattr(self, mode, namespace.pop("plan"))
+
+    def __repr__(self) -> str:
+        return " | ".join(".".join(step.name for step in branch) or "self" for branch in self.branches)
+
+    def __generate(self, mode: str) -> str:
+        shared = 0
+        while len(self.branches) > 1 and all(len(branch) > shared for branch in self.branches) and \
+                len({branch[shared] for branch in self.branches}) == 1 and self.branches[0][shared].single:
+            shared += 1
+
+        lines = ["def plan(p0):"]
+        if mode == "all":
+            lines += ["    result = []", "    append = result.append"]
+
+        names = (f"p{index}" for index in count(1))
+        prefix_lines, var, depth = self.__emit(steps=self.branches[0][:shared], var="p0", depth=1, names=names)
+        lines += prefix_lines
+        for branch in self.branches:
+            branch_lines, leaf, leaf_depth = self.__emit(steps=branch[shared:], var=var, depth=depth, names=names)
+            lines += branch_lines
+            lines.append("    " * leaf_depth + LEAF_ACTIONS[mode].format(var=leaf))
+
+        if mode == "all":
+            lines.append("    return result")
+        elif mode == "first":
+            lines.append("    return None")
+        elif mode == "iter":
+            lines.append("    return")
+            lines.append("    yield")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def __emit(steps: Tuple[Step, ...], var: str, depth: int, names) -> Tuple[List[str], str, int]:
+        lines = []
+        for step in steps:
+            out, tmp = next(names), next(names)
+            for line in step.template:
+                lines.append("    " * depth + line.format(inp=var, out=out, tmp=tmp))
+                if line.endswith(":"):
+                    depth += 1
+            var = out
+        return lines, var, depth
+
+
+class Path:
+
+    def __init__(self, *steps: Union[Step, Path]):
+        self.steps = tuple(chain.from_iterable(step.steps if isinstance(step, Path) else (step,) for step in steps))
+
+    def __add__(self, other: Union[Step, Path]) -> Path:
+        return Path(self, other)
+
+    def __or__(self, other: Union[Path, Paths]) -> Paths:
+        return Paths(self) | other
+
+    def compile(self) -> Plan:
+        return Plan(branches=[self.steps])
+
+
+class Paths:
+
+    def __init__(self, *paths: Path):
+        self.paths = list(paths)
+
+    def __or__(self, other: Union[Path, Paths]) -> Paths:
+        return Paths(*self.paths, *(other.paths if isinstance(other, Paths) else [other]))
+
+    def compile(self) -> Plan:
+        return Plan(branches=[path.steps for path in self.paths])
+
+
+def repeat(step: Union[Step, Path], times: int) -> Path:
+    return Path(*[step] * times)
+
+
+father = Path(mother, spouse)
@@ -10,10 +10,20 @@ class Gender(Enum):
     FEMALE = "Female"
 
 
+MALE_CODE = 0
+FEMALE_CODE = 1
+
+GENDER_CODES = {Gender.MALE: MALE_CODE, Gender.FEMALE: FEMALE_CODE}
+GENDERS = (Gender.MALE, Gender.FEMALE)
+
+NO_CHILDREN = ()
+
+
 class Person:
 
     def __init__(self, name: str, gender: Enum):
         self.name = name.capitalize()
+        self.encoded_name = self.name.encode()
         self.gender = gender
         self.mother = None
         self.spouse = None
@@ -47,3 +57,81 @@ class Person:
     def add_children(self, children: list):
         for child in children:
             self.add_child(child)
+
+
+class CompactPerson:
+    __slots__ = ("name", "encoded_name", "gender_code", "mother", "spouse", "children")
+
+    def __init__(self, name: str, gender: Enum):
+        self.name = name.capitalize()
+        self.encoded_name = self.name.encode()
+        self.gender_code = GENDER_CODES[gender]
+        self.mother = None
+        self.spouse = None
+        self.children = NO_CHILDREN
+
+    @property
+    def gender(self) -> Enum:
+        return GENDERS[self.gender_code]
+
+    def __is_mother(self) -> bool:
+        return self.gender_code == FEMALE_CODE and self.spouse is not None
+
+    def set_spouse(self, spouse: CompactPerson):
+        self.spouse = spouse
+        spouse.spouse = self
+        spouse.children = self.children
+
+    @property
+    def total_children(self):
+        return len(self.children)
+
+    def add_child(self, child: CompactPerson) -> Enum:
+        if not self.__is_mother():
+            return Responses.CHILD_ADDITION_FAILED
+
+        if self.children is NO_CHILDREN:
+            self.children = self.spouse.children = []
+
+        self.children.append(child)
+        child.mother = self
+        return Responses.CHILD_ADDITION_SUCCEEDED
+
+    def add_children(self, children: list):
+        for child in children:
+            self.add_child(child)
+
+
+class SummarizedPerson(Person):
+
+    def __init__(self, name: str, gender: Enum):
+        super().__init__(name=name, gender=gender)
+        self.sons = []
+        self.daughters = []
+        self.brothers = []
+        self.sisters = []
+
+    def set_spouse(self, spouse: SummarizedPerson):
+        super().set_spouse(spouse=spouse)
+        spouse.sons = self.sons
+        spouse.daughters = self.daughters
+
+    def add_child(self, child: SummarizedPerson) -> Enum:
+        status = super().add_child(child=child)
+        if status != Responses.CHILD_ADDITION_SUCCEEDED:
+            return status
+
+        child.brothers = list(self.sons)
+        child.sisters = list(self.daughters)
+        if child.gender is Gender.MALE:
+            for sibling in self.children:
+                if sibling is not child:
+                    sibling.brothers.append(child)
+            self.sons.append(child)
+        else:
+            for sibling in self.children:
+                if sibling is not child:
+                    sibling.sisters.append(child)
+            self.daughters.append(child)
+
+        return status
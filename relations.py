@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 from constants import Relations
-from person import Gender, Person
+from paths import (Path, children, father, female, male, mother, siblings,
+                   spouse)
+from person import Person, SummarizedPerson
 
 
 class BaseRelation(ABC):
@@ -13,127 +15,96 @@ class BaseRelation(ABC):
     def relatives(self) -> List[Person]:
         pass
 
+    def iter_relatives(self) -> Iterator[Person]:
+        relatives = self.relatives()
+        if relatives is None:
+            return iter(())
+        return iter(relatives) if isinstance(relatives, list) else iter((relatives,))
 
-class MotherOf(BaseRelation):
-    def relatives(self) -> Optional[Person]:
-        return self.person.mother
 
+class PathRelation(BaseRelation):
+    path = None
+    plan = None
 
-class FatherOf(BaseRelation):
-    def relatives(self) -> Optional[Person]:
-        mother = self.person.mother
-        if not mother:
-            return None
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.path is not None:
+            cls.plan = cls.path.compile()
 
-        return mother.spouse
+    def relatives(self) -> List[Person]:
+        return self.plan.all(self.person)
 
+    def iter_relatives(self) -> Iterator[Person]:
+        return self.plan.iter(self.person)
 
-class SiblingsOf(BaseRelation):
-    def relatives(self) -> List[Person]:
-        mother = self.person.mother
-        if not mother:
-            return []
 
-        siblings = [child for child in mother.children if child.name != self.person.name]
-        return siblings
+class SinglePathRelation(PathRelation):
+    def relatives(self) -> Optional[Person]:
+        return self.plan.first(self.person)
 
 
-class BrothersOf(BaseRelation):
-    def relatives(self) -> List[Person]:
-        siblings = SiblingsOf(self.person).relatives()
-        brothers = [sibling for sibling in siblings if sibling.gender == Gender.MALE]
-        return brothers
+class MotherOf(SinglePathRelation):
+    path = Path(mother)
 
 
-class SistersOf(BaseRelation):
-    def relatives(self) -> List[Person]:
-        siblings = SiblingsOf(self.person).relatives()
-        sisters = [sibling for sibling in siblings if sibling.gender == Gender.FEMALE]
-        return sisters
+class FatherOf(SinglePathRelation):
+    path = father
 
 
-class SonsOf(BaseRelation):
-    def relatives(self) -> List[Person]:
-        sons = [child for child in self.person.children if child.gender == Gender.MALE]
-        return sons
+class SiblingsOf(PathRelation):
+    path = Path(siblings)
 
 
-class DaughtersOf(BaseRelation):
-    def relatives(self) -> List[Person]:
-        daughters = [child for child in self.person.children if child.gender == Gender.FEMALE]
-        return daughters
+class BrothersOf(PathRelation):
+    path = Path(siblings, male)
 
 
-class PaternalUnclesOf(BaseRelation):
-    def relatives(self) -> List[Person]:
-        father = FatherOf(self.person).relatives()
-        if not father:
-            return []
+class SistersOf(PathRelation):
+    path = Path(siblings, female)
 
-        paternal_uncles = BrothersOf(father).relatives()
-        return paternal_uncles
 
+class SonsOf(PathRelation):
+    path = Path(children, male)
 
-class PaternalAuntsOf(BaseRelation):
-    def relatives(self) -> List[Person]:
-        father = FatherOf(self.person).relatives()
-        if not father:
-            return []
 
-        paternal_aunts = SistersOf(father).relatives()
-        return paternal_aunts
+class DaughtersOf(PathRelation):
+    path = Path(children, female)
 
 
-class MaternalUnclesOf(BaseRelation):
-    def relatives(self) -> List[Person]:
-        mother = self.person.mother
-        if not mother:
-            return []
+class PaternalUnclesOf(PathRelation):
+    path = Path(father, siblings, male)
 
-        maternal_uncles = BrothersOf(mother).relatives()
-        return maternal_uncles
 
+class PaternalAuntsOf(PathRelation):
+    path = Path(father, siblings, female)
 
-class MaternalAuntsOf(BaseRelation):
-    def relatives(self) -> List[Person]:
-        mother = self.person.mother
-        if not mother:
-            return []
 
-        maternal_aunts = SistersOf(mother).relatives()
-        return maternal_aunts
+class MaternalUnclesOf(PathRelation):
+    path = Path(mother, siblings, male)
 
 
-class BrothersInLawOf(BaseRelation):
-    def relatives(self) -> List[Person]:
-        brothers_in_law = []
+class MaternalAuntsOf(PathRelation):
+    path = Path(mother, siblings, female)
 
-        spouse = self.person.spouse
-        if spouse:
-            brothers_of_spouse = BrothersOf(spouse).relatives()
-            brothers_in_law.extend(brothers_of_spouse)
 
-        sisters = SistersOf(self.person).relatives()
-        husbands_of_sisters = [sister.spouse for sister in sisters if sister.spouse]
+class BrothersInLawOf(PathRelation):
+    path = Path(spouse, siblings, male) | Path(siblings, female, spouse)
 
-        brothers_in_law.extend(husbands_of_sisters)
-        return brothers_in_law
 
+class SistersInLawOf(PathRelation):
+    path = Path(siblings, male, spouse) | Path(spouse, siblings, female)
 
-class SistersInLawOf(BaseRelation):
-    def relatives(self) -> List[Person]:
-        sisters_in_law = []
 
-        brothers = BrothersOf(self.person).relatives()
-        wives_of_brothers = [brother.spouse for brother in brothers if brother.spouse]
-        sisters_in_law.extend(wives_of_brothers)
+class CousinsOf(PathRelation):
+    path = Path(mother, siblings, children) | Path(mother, spouse, siblings, children)
 
-        spouse = self.person.spouse
-        if spouse:
-            sisters_of_spouse = SistersOf(spouse).relatives()
-            sisters_in_law.extend(sisters_of_spouse)
 
-        return sisters_in_law
+class GrandparentsOf(PathRelation):
+    path = Path(mother, mother) | Path(mother, mother, spouse) | Path(father, mother) | Path(father, mother, spouse)
+
+
+class GrandchildrenOf(PathRelation):
+    path = Path(children, children)
 
 
 RELATION_CLASS_PICKER = {
@@ -149,5 +120,87 @@ RELATION_CLASS_PICKER = {
     Relations.MaternalAunt: MaternalAuntsOf,
     Relations.PaternalAunt: PaternalAuntsOf,
     Relations.MaternalUncle: MaternalUnclesOf,
-    Relations.PaternalUncle: PaternalUnclesOf
+    Relations.PaternalUncle: PaternalUnclesOf,
+    Relations.Cousins: CousinsOf,
+    Relations.Grandparents: GrandparentsOf,
+    Relations.Grandchildren: GrandchildrenOf
+}
+
+
+class SummarizedBrothersOf(BaseRelation):
+    def relatives(self) -> List[Person]:
+        return list(self.person.brothers)
+
+
+class SummarizedSistersOf(BaseRelation):
+    def relatives(self) -> List[Person]:
+        return list(self.person.sisters)
+
+
+class SummarizedSonsOf(BaseRelation):
+    def relatives(self) -> List[Person]:
+        return list(self.person.sons)
+
+
+class SummarizedDaughtersOf(BaseRelation):
+    def relatives(self) -> List[Person]:
+        return list(self.person.daughters)
+
+
+class SummarizedPaternalUnclesOf(BaseRelation):
+    def relatives(self) -> List[Person]:
+        mother = self.person.mother
+        husband = mother.spouse if mother else None
+        return list(husband.brothers) if husband else []
+
+
+class SummarizedPaternalAuntsOf(BaseRelation):
+    def relatives(self) -> List[Person]:
+        mother = self.person.mother
+        husband = mother.spouse if mother else None
+        return list(husband.sisters) if husband else []
+
+
+class SummarizedMaternalUnclesOf(BaseRelation):
+    def relatives(self) -> List[Person]:
+        mother = self.person.mother
+        return list(mother.brothers) if mother else []
+
+
+class SummarizedMaternalAuntsOf(BaseRelation):
+    def relatives(self) -> List[Person]:
+        mother = self.person.mother
+        return list(mother.sisters) if mother else []
+
+
+class SummarizedBrothersInLawOf(BaseRelation):
+    def relatives(self) -> List[Person]:
+        spouse = self.person.spouse
+        husbands_of_sisters = [sister.spouse for sister in self.person.sisters if sister.spouse]
+        return spouse.brothers + husbands_of_sisters if spouse else husbands_of_sisters
+
+
+class SummarizedSistersInLawOf(BaseRelation):
+    def relatives(self) -> List[Person]:
+        wives_of_brothers = [brother.spouse for brother in self.person.brothers if brother.spouse]
+        spouse = self.person.spouse
+        return wives_of_brothers + spouse.sisters if spouse else wives_of_brothers
+
+
+SUMMARIZED_RELATION_CLASS_PICKER = {
+    **RELATION_CLASS_PICKER,
+    Relations.Brother: SummarizedBrothersOf,
+    Relations.Sister: SummarizedSistersOf,
+    Relations.Son: SummarizedSonsOf,
+    Relations.Daughter: SummarizedDaughtersOf,
+    Relations.BrotherInLaw: SummarizedBrothersInLawOf,
+    Relations.SisterInLaw: SummarizedSistersInLawOf,
+    Relations.MaternalAunt: SummarizedMaternalAuntsOf,
+    Relations.PaternalAunt: SummarizedPaternalAuntsOf,
+    Relations.MaternalUncle: SummarizedMaternalUnclesOf,
+    Relations.PaternalUncle: SummarizedPaternalUnclesOf
+}
+
+RELATION_PICKERS = {
+    SummarizedPerson: SUMMARIZED_RELATION_CLASS_PICKER
 }
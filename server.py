@@ -0,0 +1,136 @@
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from constants import Relations
+from family import Family
+from geektrust import TEXT_OPERATION_HANDLERS, execute, render
+from instrumentation import percentile
+
+READ_LIMIT = 1 << 16
+
+
+class FamilyServer:
+
+    def __init__(self, family: Family):
+        self.family = family
+
+    def respond(self, line: bytes) -> bytes:
+        try:
+            words = line.decode("utf-8").split()
+            if not words:
+                return b""
+
+            if words[0] not in TEXT_OPERATION_HANDLERS:
+                return b"INVALID_COMMAND\n"
+            output = execute(family=self.family, words=words)
+        except (IndexError, KeyError, ValueError):
+            return b"INVALID_COMMAND\n"
+        return render(output).encode("utf-8")
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                writer.write(self.respond(line=line))
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, unix_path: Optional[str] = None):
+        if unix_path:
+            return await asyncio.start_unix_server(self.handle_connection, path=unix_path, limit=READ_LIMIT)
+        return await asyncio.start_server(self.handle_connection, host=host, port=port, limit=READ_LIMIT)
+
+
+async def open_connection(host: str, port: int, unix_path: Optional[str]):
+    if unix_path:
+        return await asyncio.open_unix_connection(path=unix_path)
+    return await asyncio.open_connection(host=host, port=port)
+
+
+async def _run_client(host: str, port: int, unix_path: Optional[str], requests: List[bytes], depth: int,
+                      latencies: List[float]):
+    reader, writer = await open_connection(host=host, port=port, unix_path=unix_path)
+    in_flight = asyncio.Semaphore(depth)
+    sent_at = deque()
+
+    async def send():
+        for request in requests:
+            await in_flight.acquire()
+            sent_at.append(time.perf_counter())
+            writer.write(request)
+            await writer.drain()
+
+    async def receive():
+        for _ in requests:
+            await reader.readline()
+            latencies.append(time.perf_counter() - sent_at.popleft())
+            in_flight.release()
+
+    await asyncio.gather(send(), receive())
+    writer.close()
+    await writer.wait_closed()
+
+
+async def load_test(host: str, port: int, unix_path: Optional[str], connections: int, requests: int,
+                    depth: int) -> Dict[str, float]:
+    members = [member.name for member in Family().members]
+    relations = list(Relations)
+    commands = [f"GET_RELATIONSHIP {members[index % len(members)]} {relations[index % len(relations)].value}\n"
+                .encode("utf-8") for index in range(requests)]
+
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(_run_client(host, port, unix_path, commands, depth, latencies)
+                           for _ in range(connections)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+async def serve(host: str, port: int, unix_path: Optional[str]):
+    server = await FamilyServer(family=Family()).start(host=host, port=port, unix_path=unix_path)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-path")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("serve")
+
+    load_parser = subparsers.add_parser("load")
+    load_parser.add_argument("--connections", type=int, default=8)
+    load_parser.add_argument("--requests", type=int, default=100_000)
+    load_parser.add_argument("--depth", type=int, default=64)
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        asyncio.run(serve(host=args.host, port=args.port, unix_path=args.unix_path))
+    elif args.command == "load":
+        report = asyncio.run(load_test(host=args.host, port=args.port, unix_path=args.unix_path,
+                                       connections=args.connections, requests=args.requests, depth=args.depth))
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
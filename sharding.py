@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from enum import Enum
+from typing import Dict, List, Optional, Sequence, Union
+
+from constants import Responses
+from family import Family
+from geektrust import process
+from lineage import WalkedLineage
+from person import Gender, Person
+from relations import RELATION_CLASS_PICKER
+
+HOME_SHARD = 0
+SHARD_SUFFIX = ".shard.json"
+NEEDS_STITCHING = "NEEDS_STITCHING"
+
+
+class ShardBoundary(Exception):
+    pass
+
+
+class StubPerson:
+    __slots__ = ("name", "encoded_name", "gender", "owner")
+
+    def __init__(self, name: str, gender: Enum, owner: int):
+        self.name = name
+        self.encoded_name = name.encode()
+        self.gender = gender
+        self.owner = owner
+
+    @property
+    def mother(self):
+        raise ShardBoundary(self.name)
+
+    @property
+    def spouse(self):
+        raise ShardBoundary(self.name)
+
+    @property
+    def children(self):
+        raise ShardBoundary(self.name)
+
+
+def assign_shards(family: Family, roots: Sequence[str]) -> Dict[Person, int]:
+    shards_by_root = {}
+    for shard, root_name in enumerate(roots, start=HOME_SHARD + 1):
+        root = family.member_exists(person_name=root_name)
+        if not root or root.gender is not Gender.FEMALE or root.spouse is None:
+            raise ValueError(f"{root_name} is not a matriarch of this family")
+        shards_by_root[root] = shard
+
+    owners = {}
+    for member in family.members:
+        chain = []
+        person = member
+        while person not in owners:
+            anchor = person.spouse if person.gender is Gender.MALE and person.spouse else person
+            if anchor in shards_by_root:
+                owners[person] = shards_by_root[anchor]
+                break
+
+            parent = anchor.mother or (anchor.spouse.mother if anchor.spouse else None)
+            if parent is None:
+                owners[person] = HOME_SHARD
+                break
+
+            chain.append(person)
+            person = parent
+
+        for link in chain:
+            owners[link] = owners[person]
+    return owners
+
+
+def export_shards(family: Family, roots: Sequence[str], directory: str) -> List[str]:
+    owners = assign_shards(family=family, roots=roots)
+    records = [[] for _ in range(len(roots) + 1)]
+    for member in family.members:
+        owner = owners[member]
+        shards = {owner}
+        for relative in (member.mother, member.spouse):
+            if relative is not None:
+                shards.add(owners[relative])
+        if member.gender is Gender.FEMALE:
+            shards.update(owners[child] for child in member.children)
+
+        for shard in sorted(shards):
+            children = [child.name for child in member.children] \
+                if shard == owner and member.gender is Gender.FEMALE else []
+            records[shard].append([member.name, member.gender.value, owner,
+                                   member.mother.name if member.mother else None,
+                                   member.spouse.name if member.spouse else None, children])
+
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for shard, shard_records in enumerate(records):
+        path = os.path.join(directory, f"{shard}{SHARD_SUFFIX}")
+        with open(path, "w") as file:
+            json.dump({"shard": shard, "members": shard_records}, file)
+        paths.append(path)
+    return paths
+
+
+class Shard:
+
+    def __init__(self, shard_id: int, records: List[list]):
+        self.shard_id = shard_id
+        self.members = {}
+        self.stubs = {}
+        for name, gender, owner, _, _, _ in records:
+            if owner == shard_id:
+                self.members[name] = Person(name=name, gender=Gender(gender))
+            else:
+                self.stubs[name] = StubPerson(name=name, gender=Gender(gender), owner=owner)
+
+        for name, _, owner, _, spouse_name, _ in records:
+            member = self.members.get(name)
+            if member is None or spouse_name is None or member.spouse is not None:
+                continue
+
+            spouse = self.members.get(spouse_name)
+            if spouse is None:
+                member.spouse = self.stubs[spouse_name]
+            elif member.gender is Gender.FEMALE:
+                member.set_spouse(spouse=spouse)
+            else:
+                spouse.set_spouse(spouse=member)
+
+        for name, _, owner, mother_name, _, children in records:
+            member = self.members.get(name)
+            if member is None:
+                continue
+
+            if mother_name is not None and mother_name not in self.members:
+                member.mother = self.stubs[mother_name]
+            for child_name in children:
+                child = self.members.get(child_name)
+                if child is None:
+                    member.children.append(self.stubs[child_name])
+                else:
+                    member.add_child(child=child)
+
+    def get_relationship(self, member_name: str, relation: Enum) -> Optional[Union[Enum, str, List[str]]]:
+        member = self.members.get(member_name)
+        if member is None:
+            return Responses.PERSON_NOT_FOUND
+
+        try:
+            relatives = RELATION_CLASS_PICKER[relation](member).relatives()
+        except ShardBoundary:
+            return NEEDS_STITCHING
+
+        if isinstance(relatives, list):
+            return [relative.name for relative in relatives] or None
+        return relatives.name if relatives else None
+
+    def describe(self, member_name: str) -> Optional[tuple]:
+        member = self.members.get(member_name)
+        if member is None:
+            return None
+
+        return (member.gender.value, member.mother.name if member.mother else None,
+                member.spouse.name if member.spouse else None, [child.name for child in member.children])
+
+    def add_member(self, mother_name: str, new_member_name: str, new_member_gender: Enum) -> Enum:
+        mother = self.members.get(mother_name)
+        if mother is None:
+            return Responses.PERSON_NOT_FOUND
+
+        if new_member_name in self.members or new_member_name in self.stubs:
+            return Responses.CHILD_ADDITION_FAILED
+
+        child = Person(name=new_member_name, gender=new_member_gender)
+        status = mother.add_child(child=child)
+        if status == Responses.CHILD_ADDITION_SUCCEEDED:
+            self.members[child.name] = child
+        return status
+
+
+def read_shard(path: str) -> dict:
+    with open(path) as file:
+        return json.load(file)
+
+
+def load_shard(path: str) -> Shard:
+    document = read_shard(path=path)
+    return Shard(shard_id=document["shard"], records=document["members"])
+
+
+def _serve_shard(connection, path: str):
+    shard = load_shard(path=path)
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+
+        method, arguments = request
+        connection.send(getattr(shard, method)(**arguments))
+    connection.close()
+
+
+class ShardClient:
+
+    def __init__(self, path: str, separate_process: bool):
+        self.shard = None
+        self.process = None
+        if not separate_process:
+            self.shard = load_shard(path=path)
+            return
+
+        self.connection, worker_connection = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_serve_shard, args=(worker_connection, path), daemon=True)
+        self.process.start()
+        worker_connection.close()
+
+    def call(self, method: str, **arguments):
+        if self.shard is not None:
+            return getattr(self.shard, method)(**arguments)
+
+        self.connection.send((method, arguments))
+        return self.connection.recv()
+
+    def close(self):
+        if self.process is not None:
+            self.connection.send(None)
+            self.process.join()
+            self.connection.close()
+
+
+class RemoteMember:
+    __slots__ = ("family", "name", "descriptions")
+
+    def __init__(self, family: ShardedFamily, name: str, descriptions: Dict[str, tuple] = None):
+        self.family = family
+        self.name = name
+        self.descriptions = descriptions if descriptions is not None else {}
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, RemoteMember) and self.name == other.name
+
+    def __hash__(self) -> int:
+        return hash(self.name)
+
+    @property
+    def encoded_name(self) -> bytes:
+        return self.name.encode()
+
+    def __relative(self, name: Optional[str]) -> Optional[RemoteMember]:
+        return RemoteMember(self.family, name, self.descriptions) if name else None
+
+    def __description(self) -> tuple:
+        description = self.descriptions.get(self.name)
+        if description is None:
+            description = self.descriptions[self.name] = self.family.describe(member_name=self.name)
+        return description
+
+    @property
+    def gender(self) -> Enum:
+        return Gender(self.__description()[0])
+
+    @property
+    def mother(self) -> Optional[RemoteMember]:
+        return self.__relative(name=self.__description()[1])
+
+    @property
+    def spouse(self) -> Optional[RemoteMember]:
+        return self.__relative(name=self.__description()[2])
+
+    @property
+    def children(self) -> List[RemoteMember]:
+        return [RemoteMember(self.family, name, self.descriptions) for name in self.__description()[3]]
+
+
+class ShardedFamily(WalkedLineage):
+
+    def __init__(self, paths: Sequence[str], separate_processes: bool = False):
+        self.owners = {}
+        self.clients = {}
+        self.stitched = 0
+        for path in paths:
+            document = read_shard(path=path)
+            shard = document["shard"]
+            self.owners.update((name, shard) for name, _, owner, _, _, _ in document["members"] if owner == shard)
+            self.clients[shard] = ShardClient(path=path, separate_process=separate_processes)
+
+    @property
+    def total_members(self) -> int:
+        return len(self.owners)
+
+    def close(self):
+        for client in self.clients.values():
+            client.close()
+
+    def member_exists(self, person_name: str) -> Optional[RemoteMember]:
+        person_name = person_name.capitalize()
+        return RemoteMember(self, person_name) if person_name in self.owners else None
+
+    def describe(self, member_name: str) -> tuple:
+        return self.clients[self.owners[member_name]].call("describe", member_name=member_name)
+
+    def add_member(self, mother_name: str, new_member_name: str, new_member_gender: Enum) -> Enum:
+        shard = self.owners.get(mother_name.capitalize())
+        if shard is None:
+            return Responses.PERSON_NOT_FOUND
+
+        new_member_name = new_member_name.capitalize()
+        if new_member_name in self.owners:
+            return Responses.CHILD_ADDITION_FAILED
+
+        status = self.clients[shard].call("add_member", mother_name=mother_name.capitalize(),
+                                          new_member_name=new_member_name, new_member_gender=new_member_gender)
+        if status == Responses.CHILD_ADDITION_SUCCEEDED:
+            self.owners[new_member_name] = shard
+        return status
+
+    def get_relationship(self, member_name: str, relation: Enum) -> Optional[Union[Enum, RemoteMember, List]]:
+        member_name = member_name.capitalize()
+        shard = self.owners.get(member_name)
+        if shard is None:
+            return Responses.PERSON_NOT_FOUND
+
+        result = self.clients[shard].call("get_relationship", member_name=member_name, relation=relation)
+        if result == NEEDS_STITCHING:
+            self.stitched += 1
+            return RELATION_CLASS_PICKER[relation](RemoteMember(self, member_name)).relatives() or None
+
+        if isinstance(result, list):
+            return [RemoteMember(self, name) for name in result]
+        return RemoteMember(self, result) if isinstance(result, str) else result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="action", required=True)
+
+    export_parser = subparsers.add_parser("export")
+    export_parser.add_argument("directory")
+    export_parser.add_argument("roots", nargs="+")
+
+    run_parser = subparsers.add_parser("run")
+    run_parser.add_argument("commands_file")
+    run_parser.add_argument("shard_files", nargs="+")
+
+    args = parser.parse_args()
+    if args.action == "export":
+        print("\n".join(export_shards(family=Family(), roots=args.roots, directory=args.directory)))
+        return
+
+    family = ShardedFamily(paths=args.shard_files, separate_processes=True)
+    try:
+        with open(args.commands_file) as file:
+            process(lines=file, family=family, stream=sys.stdout)
+    finally:
+        family.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import Union
+
+from columnar import ColumnarFamily
+from family import Family
+
+MAGIC = b"GTFAMSNP"
+VERSION = 2
+HEADER = struct.Struct("<8sIIQQQ")
+ALIGNMENT = 8
+NAME_SEPARATOR = "\n"
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def _padding(size: int) -> bytes:
+    return b"\0" * (-size % ALIGNMENT)
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def save_snapshot(family: Union[Family, ColumnarFamily], path: str):
+    if isinstance(family, Family):
+        family = ColumnarFamily.from_family(family=family)
+    family.compact()
+
+    names = NAME_SEPARATOR.join(family.names).encode("utf-8")
+    sections = [_little_endian(section) for section in
+                (family.genders, family.mothers, family.spouses, family.child_offsets, family.child_ids)]
+    checksum = 0
+    for data in sections + [names]:
+        checksum = zlib.crc32(data, checksum)
+    header = HEADER.pack(MAGIC, VERSION, checksum, family.total_members, len(family.child_ids), len(names))
+
+    with open(path, "wb") as file:
+        file.write(header)
+        file.write(_padding(HEADER.size))
+        for data in sections:
+            file.write(data)
+            file.write(_padding(len(data)))
+        file.write(names)
+
+
+def load_snapshot(path: str) -> ColumnarFamily:
+    with open(path, "rb") as file:
+        file_size = os.fstat(file.fileno()).st_size
+        if file_size < HEADER.size:
+            raise SnapshotError(f"{path} is too small to be a family snapshot")
+
+        magic, version, checksum, total_members, total_children, names_size = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC:
+            raise SnapshotError(f"{path} is not a family snapshot")
+        if version != VERSION:
+            raise SnapshotError(f"Unsupported family snapshot version {version}")
+
+        family = ColumnarFamily()
+        file.seek(len(_padding(HEADER.size)), os.SEEK_CUR)
+        sections = [("genders", "b", total_members), ("mothers", "q", total_members), ("spouses", "q", total_members),
+                    ("child_offsets", "q", total_members + 1), ("child_ids", "q", total_children)]
+        expected_size = HEADER.size + len(_padding(HEADER.size)) + names_size
+        for _, typecode, length in sections:
+            size = array(typecode).itemsize * length
+            expected_size += size + len(_padding(size))
+        if expected_size != file_size:
+            raise SnapshotError(f"{path} is truncated or corrupt")
+
+        running_checksum = 0
+        for attribute, typecode, length in sections:
+            values = array(typecode)
+            values.fromfile(file, length)
+            running_checksum = zlib.crc32(values, running_checksum)
+            if sys.byteorder != "little":
+                values.byteswap()
+            setattr(family, attribute, values)
+            file.seek(len(_padding(len(values) * values.itemsize)), os.SEEK_CUR)
+
+        names = file.read(names_size)
+        if zlib.crc32(names, running_checksum) != checksum:
+            raise SnapshotError(f"{path} failed its checksum")
+
+    family.names = names.decode("utf-8").split(NAME_SEPARATOR) if total_members else []
+    family.ids_by_name = dict(zip(family.names, range(total_members)))
+    return family
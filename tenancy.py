@@ -0,0 +1,122 @@
+import os
+import re
+import sys
+from collections import OrderedDict
+from typing import IO, Iterable, List
+
+from columnar import ColumnarFamily
+from constants import Responses
+from family import Family
+from geektrust import execute, render
+from snapshot import load_snapshot, save_snapshot
+
+SNAPSHOT_SUFFIX = ".snapshot"
+DICT_ENTRY_BYTES = 100
+MEMBER_BYTES = 1 + 8 * 5 + DICT_ENTRY_BYTES
+FAMILY_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+
+def estimate_bytes(family: ColumnarFamily) -> int:
+    arrays = (family.genders, family.mothers, family.spouses, family.child_offsets, family.child_ids)
+    total = sum(values.itemsize * len(values) for values in arrays)
+    total += sum(8 + 8 * len(children) for children in family.extra_children.values())
+    return total + 8 * len(family.names) + DICT_ENTRY_BYTES * len(family.ids_by_name)
+
+
+def intern_names(family: ColumnarFamily) -> ColumnarFamily:
+    family.names = [sys.intern(name) for name in family.names]
+    family.ids_by_name = dict(zip(family.names, range(len(family.names))))
+    return family
+
+
+class FamilyRegistry:
+
+    def __init__(self, directory: str, memory_budget: int = 1 << 30):
+        self.directory = directory
+        self.memory_budget = memory_budget
+        self.loaded = OrderedDict()
+        self.sizes = {}
+        self.loaded_bytes = 0
+        self.dirty = set()
+        os.makedirs(directory, exist_ok=True)
+
+    def __path(self, family_id: str) -> str:
+        if not FAMILY_ID_PATTERN.fullmatch(family_id):
+            raise ValueError(f"Invalid family id {family_id!r}")
+        return os.path.join(self.directory, family_id + SNAPSHOT_SUFFIX)
+
+    def exists(self, family_id: str) -> bool:
+        if family_id in self.loaded:
+            return True
+        return bool(FAMILY_ID_PATTERN.fullmatch(family_id)) and os.path.exists(self.__path(family_id=family_id))
+
+    def create(self, family_id: str, family: Family = None) -> ColumnarFamily:
+        columnar_family = intern_names(family=ColumnarFamily.from_family(family=family or Family()))
+        save_snapshot(family=columnar_family, path=self.__path(family_id=family_id))
+        self.__admit(family_id=family_id, family=columnar_family)
+        return columnar_family
+
+    def get(self, family_id: str) -> ColumnarFamily:
+        family = self.loaded.get(family_id)
+        if family is not None:
+            self.loaded.move_to_end(family_id)
+            self.__evict(keep=family_id)
+            return family
+
+        family = intern_names(family=load_snapshot(path=self.__path(family_id=family_id)))
+        self.__admit(family_id=family_id, family=family)
+        return family
+
+    def __admit(self, family_id: str, family: ColumnarFamily):
+        if family_id in self.loaded:
+            del self.loaded[family_id]
+            self.loaded_bytes -= self.sizes.pop(family_id)
+            self.dirty.discard(family_id)
+
+        self.loaded[family_id] = family
+        self.sizes[family_id] = 0
+        self.__grow(family_id=family_id, size=estimate_bytes(family=family))
+
+    def __grow(self, family_id: str, size: int):
+        self.sizes[family_id] += size
+        self.loaded_bytes += size
+        self.__evict(keep=family_id)
+
+    def __evict(self, keep: str):
+        while self.loaded_bytes > self.memory_budget and len(self.loaded) > 1:
+            family_id = next(iter(self.loaded))
+            if family_id == keep:
+                break
+            self.evict(family_id=family_id)
+
+    def evict(self, family_id: str):
+        family = self.loaded.pop(family_id)
+        self.loaded_bytes -= self.sizes.pop(family_id)
+        if family_id in self.dirty:
+            save_snapshot(family=family, path=self.__path(family_id=family_id))
+            self.dirty.discard(family_id)
+
+    def flush(self):
+        for family_id in list(self.dirty):
+            save_snapshot(family=self.loaded[family_id], path=self.__path(family_id=family_id))
+        self.dirty.clear()
+
+    def execute(self, family_id: str, words: List[str]):
+        if not self.exists(family_id=family_id):
+            return Responses.FAMILY_NOT_FOUND
+
+        family = self.get(family_id=family_id)
+        output = execute(family=family, words=words)
+        if output == Responses.CHILD_ADDITION_SUCCEEDED:
+            self.dirty.add(family_id)
+            self.__grow(family_id=family_id, size=MEMBER_BYTES)
+        return output
+
+
+def process_tenants(lines: Iterable[str], registry: FamilyRegistry, stream: IO[str]):
+    for line in lines:
+        words = line.split()
+        if len(words) < 2:
+            continue
+
+        stream.write(render(registry.execute(family_id=words[0], words=words[1:])))
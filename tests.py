@@ -1,9 +1,34 @@
+import asyncio
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import threading
 import unittest
 from typing import List
+from unittest import mock
 
+from benchmarks import grow_family
+from columnar import (BATCH_RELATION_PICKER, COLUMNAR_RELATION_PICKER,
+                      ColumnarFamily)
+from concurrency import ConcurrentFamily
 from constants import Relations, Responses
 from family import Family
-from person import Gender, Person
+from geektrust import process, process_bytes
+from ingest import read_csv_records, read_jsonl_records
+from instrumentation import Instrumentation
+from parallel import process_parallel
+from paths import Path, children, mother, repeat, spouse
+from person import CompactPerson, Gender, Person, SummarizedPerson
+from relations import RELATION_CLASS_PICKER
+from server import FamilyServer
+from sharding import ShardedFamily, export_shards, load_shard
+from snapshot import HEADER, SnapshotError, load_snapshot, save_snapshot
+from tenancy import FamilyRegistry, process_tenants
+from versions import VersionedFamily
+from wal import LOG_FILE, SNAPSHOT_FILE, DurableFamily, read_log
+from workload import generate_commands, generate_family, replay, write_workload
 
 
 class TestFamily(unittest.TestCase):
@@ -14,6 +39,16 @@ class TestFamily(unittest.TestCase):
     def get_names_list(self, result: List[Person]) -> List[str]:
         return [person.name for person in result]
 
+    def assert_same_relationships(self, family: Family, other: Family):
+        for member in family.members:
+            for relation in Relations:
+                expected = family.get_relationship(member_name=member.name, relation=relation)
+                result = other.get_relationship(member_name=member.name, relation=relation)
+                if isinstance(expected, list):
+                    self.assertEqual(self.get_names_list(result=expected), self.get_names_list(result=result))
+                else:
+                    self.assertEqual(getattr(expected, "name", expected), getattr(result, "name", result))
+
 
 class TestAddMember(TestFamily):
     def setUp(self) -> None:
@@ -49,6 +84,66 @@ class TestAddMember(TestFamily):
         self.assertEqual(len(lika.children), total_children_of_lika + 1)
         self.assertEqual(self.family.total_members, total_member + 1)
 
+    def test_add_member_when_passed_member_name_already_exists(self):
+        total_member = self.family.total_members
+
+        expected = Responses.CHILD_ADDITION_FAILED
+        result = self.family.add_member(mother_name="lika", new_member_name="vasa", new_member_gender=Gender.MALE)
+        self.assertEqual(expected, result)
+
+        lika = self.family.member_exists(person_name="lika")
+        self.assertEqual(len(lika.children), 2)
+        self.assertEqual(self.family.total_members, total_member)
+
+    def test_member_exists_is_case_insensitive(self):
+        self.family.add_member(mother_name="lika", new_member_name="john", new_member_gender=Gender.MALE)
+
+        self.assertIs(self.family.member_exists(person_name="JOHN"), self.family.member_exists(person_name="john"))
+        self.assertEqual(self.family.member_exists(person_name="jOhN").name, "John")
+
+    def test_member_exists_resolves_encoded_names(self):
+        self.family.add_members(records=[("lika", "john", Gender.MALE)])
+        columnar_family = ColumnarFamily.from_family(family=self.family)
+
+        for name in (b"John", b"jOHN", b"Lika", b"lika"):
+            member = self.family.member_exists(person_name=name)
+            self.assertIs(self.family.member_exists(person_name=name.decode()), member)
+            self.assertEqual(member.name, columnar_family.member_exists(person_name=name).name)
+        self.assertIsNone(self.family.member_exists(person_name=b"Nobody"))
+        self.assertEqual(-1, columnar_family.member_id(person_name=b"Nobody"))
+
+
+class TestAddMembers(TestFamily):
+
+    def setUp(self) -> None:
+        super(TestAddMembers, self).setUp()
+
+        self.records = [("chitra", "john", Gender.MALE), ("unknown-member", "jane", Gender.FEMALE),
+                        ("vyan", "jane", Gender.FEMALE), ("atya", "jane", Gender.FEMALE),
+                        ("satya", "jane", Gender.FEMALE), ("Satya", "JANE", Gender.MALE),
+                        ("jane", "joe", Gender.MALE), ("lika", "vasa", Gender.MALE),
+                        ("lika", "ann", Gender.FEMALE), ("chitra", "ann", Gender.FEMALE)]
+
+    def test_add_members_matches_add_member(self):
+        expected_family = Family()
+        expected = [expected_family.add_member(mother_name=mother_name, new_member_name=new_member_name,
+                                               new_member_gender=new_member_gender)
+                    for mother_name, new_member_name, new_member_gender in self.records]
+
+        result = self.family.add_members(records=iter(self.records), batch_size=3)
+        self.assertEqual(expected, result)
+        self.assertEqual(expected_family.total_members, self.family.total_members)
+        self.assert_same_relationships(family=expected_family, other=self.family)
+
+    def test_read_records(self):
+        csv_file = io.StringIO("mother,child,gender\nchitra,john,Male\n\nsatya,jane,Female\n")
+        jsonl_file = io.StringIO('{"mother": "chitra", "child": "john", "gender": "Male"}\n\n'
+                                 '{"mother": "satya", "child": "jane", "gender": "Female"}\n')
+
+        expected = [("chitra", "john", Gender.MALE), ("satya", "jane", Gender.FEMALE)]
+        self.assertEqual(expected, list(read_csv_records(file=csv_file)))
+        self.assertEqual(expected, list(read_jsonl_records(file=jsonl_file)))
+
 
 class TestGetRelation(TestFamily):
     def setUp(self) -> None:
@@ -68,6 +163,39 @@ class TestGetRelation(TestFamily):
         self.assertIsNone(result)
 
 
+class TestLazyRelation(TestFamily):
+
+    def test_lazy_relationship_matches_list_relationship(self):
+        cached_family = Family(relation_cache_size=1_000)
+        for member in self.family.members:
+            for relation in Relations:
+                expected = self.family.get_relationship(member_name=member.name, relation=relation)
+                expected = [] if expected is None else expected if isinstance(expected, list) else [expected]
+
+                for family in (self.family, cached_family, cached_family):
+                    result = family.get_relationship(member_name=member.name, relation=relation, lazy=True)
+                    self.assertEqual(self.get_names_list(result=expected), self.get_names_list(result=result))
+
+    def test_lazy_relationship_when_person_not_found(self):
+        result = self.family.get_relationship(member_name="unknown-member", relation=Relations.Siblings, lazy=True)
+        self.assertEqual(Responses.PERSON_NOT_FOUND, result)
+
+    def test_relationship_with_limit(self):
+        result = self.family.get_relationship(member_name="ish", relation=Relations.Siblings, lazy=True, limit=2)
+        self.assertEqual(["Chit", "Vich"], self.get_names_list(result=result))
+
+        result = self.family.get_relationship(member_name="ish", relation=Relations.Siblings, limit=3)
+        self.assertEqual(["Chit", "Vich", "Aras"], self.get_names_list(result=result))
+
+        result = self.family.get_relationship(member_name="ish", relation=Relations.Siblings, limit=0)
+        self.assertIsNone(result)
+
+    def test_lazy_relationship_supports_early_exit(self):
+        relatives = self.family.get_relationship(member_name="ish", relation=Relations.Siblings, lazy=True)
+        self.assertEqual("Chit", next(relatives).name)
+        self.assertEqual(["Vich", "Aras", "Satya"], self.get_names_list(result=relatives))
+
+
 class TestSiblings(TestFamily):
     def setUp(self) -> None:
         super(TestSiblings, self).setUp()
@@ -468,3 +596,910 @@ class TestSisterInLaw(TestFamily):
 
         result_names = self.get_names_list(result=result)
         self.assertEqual(expected_names, result_names)
+
+
+class TestProcess(TestFamily):
+
+    def test_process_streams_commands_in_order(self):
+        lines = iter([
+            "ADD_CHILD Chitra Aria Female\n",
+            "GET_RELATIONSHIP Lavnya Maternal-Aunt\n",
+            "\n",
+            "GET_RELATIONSHIP Aria Siblings\n",
+            "ADD_CHILD Pjali Srutak Male\n",
+            "GET_RELATIONSHIP Vasa Siblings\n",
+        ])
+        stream = io.StringIO()
+        process(lines=lines, family=self.family, stream=stream)
+
+        expected = "CHILD_ADDITION_SUCCEEDED\nAria \nJnki Ahit \nPERSON_NOT_FOUND\nNone\n"
+        self.assertEqual(expected, stream.getvalue())
+
+    def test_process_records_instrumentation(self):
+        instrumentation = Instrumentation()
+        instrumentation.attach(family=self.family)
+        lines = ["ADD_CHILD Chitra Aria Female\n", "GET_RELATIONSHIP Ish Siblings\n",
+                 "GET_RELATIONSHIP Aria Siblings\n", "GET_RELATIONSHIP Unknown Siblings\n"]
+        stream = io.StringIO()
+        process(lines=lines, family=self.family, stream=stream, instrumentation=instrumentation)
+
+        report = instrumentation.report()
+        self.assertEqual(["ADD_CHILD", "GET_RELATIONSHIP Siblings"], list(report["commands"]))
+        siblings = report["commands"]["GET_RELATIONSHIP Siblings"]
+        self.assertEqual(3, siblings["latency_ns"]["count"])
+        self.assertEqual(4, siblings["result_size"]["max"])
+        self.assertEqual(1, report["commands"]["ADD_CHILD"]["latency_ns"]["count"])
+        self.assertEqual(5, report["member_lookup_ns"]["count"])
+
+    def test_process_bytes_records_instrumentation(self):
+        instrumentation = Instrumentation()
+        lines = [b"ADD_CHILD Chitra Aria Female\n", b"GET_RELATIONSHIP Ish Siblings\n",
+                 b"GET_RELATIONSHIP Aria Siblings\n", b"GET_RELATIONSHIP Unknown Siblings\n"]
+        stream = io.BytesIO()
+        process_bytes(lines=lines, family=self.family, stream=stream, instrumentation=instrumentation)
+
+        report = instrumentation.report()
+        self.assertEqual(["ADD_CHILD", "GET_RELATIONSHIP Siblings"], list(report["commands"]))
+        self.assertEqual(3, report["commands"]["GET_RELATIONSHIP Siblings"]["latency_ns"]["count"])
+        self.assertEqual(b"CHILD_ADDITION_SUCCEEDED\n", stream.getvalue()[:25])
+
+    def test_process_bytes_matches_process(self):
+        lines = ["ADD_CHILD Chitra Aria Female\n", "ADD_CHILD Pjali Srutak Male\n", "ADD_CHILD Atya Joe Male\n",
+                 "GET_GENERATION Aria\n", "IS_DESCENDANT Aria Shan\n", "GET_COMMON_ANCESTOR Aria Laki\n",
+                 "UNKNOWN_OPERATION Aria\n", "\n"]
+        lines += [f"GET_RELATIONSHIP {member.name} {relation.value}\n"
+                  for member in self.family.members for relation in Relations]
+
+        expected = io.StringIO()
+        process(lines=lines, family=Family(), stream=expected)
+
+        result = io.BytesIO()
+        process_bytes(lines=[line.encode() for line in lines], family=self.family, stream=result)
+        self.assertEqual(expected.getvalue().encode(), result.getvalue())
+
+    def test_process_bytes_renders_pre_encoded_names(self):
+        lines = ["ADD_CHILD Chitra Élodie Female\n", "ADD_CHILD Chitra Zoë Female\n",
+                 "GET_RELATIONSHIP Aras Daughter\n", "GET_RELATIONSHIP Zoë Sister\n",
+                 "GET_RELATIONSHIP Élodie Mother\n", "GET_RELATIONSHIP Zoë Son\n"]
+        expected = io.StringIO()
+        process(lines=lines, family=Family(), stream=expected)
+
+        for family in (Family(person_class=CompactPerson), ColumnarFamily.from_family(family=Family())):
+            result = io.BytesIO()
+            process_bytes(lines=[line.encode() for line in lines], family=family, stream=result)
+            self.assertEqual(expected.getvalue().encode(), result.getvalue())
+        self.assertIn("Élodie Zoë \n", expected.getvalue())
+
+    def test_process_shows_single_relative(self):
+        stream = io.StringIO()
+        process(lines=["GET_RELATIONSHIP Vasa Mother\n", "GET_RELATIONSHIP Shan Father\n"], family=self.family,
+                stream=stream)
+
+        self.assertEqual("Satvy \nNone\n", stream.getvalue())
+
+
+class TestRelationCache(TestFamily):
+
+    def setUp(self) -> None:
+        super(TestRelationCache, self).setUp()
+
+        self.cached_family = Family(relation_cache_size=10_000)
+
+    def test_cached_relationships_are_invalidated_on_add_member(self):
+        additions = [("chitra", "john", Gender.MALE), ("satya", "jane", Gender.FEMALE),
+                     ("dritha", "joe", Gender.MALE), ("lika", "ann", Gender.FEMALE)]
+
+        self.assert_same_relationships(family=self.family, other=self.cached_family)
+        for mother_name, new_member_name, new_member_gender in additions:
+            for family in (self.family, self.cached_family):
+                family.add_member(mother_name=mother_name, new_member_name=new_member_name,
+                                  new_member_gender=new_member_gender)
+            self.assert_same_relationships(family=self.family, other=self.cached_family)
+
+    def test_cache_returns_copies(self):
+        result = self.cached_family.get_relationship(member_name="ish", relation=Relations.Siblings)
+        result.clear()
+
+        result = self.cached_family.get_relationship(member_name="ish", relation=Relations.Siblings)
+        self.assertEqual(["Chit", "Vich", "Aras", "Satya"], self.get_names_list(result=result))
+
+    def test_cache_evicts_least_recently_used_entries(self):
+        family = Family(relation_cache_size=2)
+        family.get_relationship(member_name="ish", relation=Relations.Siblings)
+        family.get_relationship(member_name="vich", relation=Relations.Siblings)
+        family.get_relationship(member_name="ish", relation=Relations.Siblings)
+        family.get_relationship(member_name="aras", relation=Relations.Siblings)
+
+        ish = family.member_exists(person_name="ish")
+        vich = family.member_exists(person_name="vich")
+        self.assertEqual(2, len(family.relation_cache))
+        self.assertIn((ish, Relations.Siblings), family.relation_cache.entries)
+        self.assertNotIn((vich, Relations.Siblings), family.relation_cache.entries)
+
+
+class TestCompactPerson(TestFamily):
+
+    def setUp(self) -> None:
+        super(TestCompactPerson, self).setUp()
+
+        self.compact_family = Family(person_class=CompactPerson)
+
+    def test_compact_person_has_no_instance_dict(self):
+        vasa = self.compact_family.member_exists(person_name="vasa")
+        self.assertFalse(hasattr(vasa, "__dict__"))
+        self.assertIs(vasa.gender, Gender.MALE)
+
+    def test_compact_family_matches_family_after_additions(self):
+        additions = [("vila", "john", Gender.MALE), ("satvy", "jane", Gender.FEMALE),
+                     ("krpi", "joe", Gender.MALE), ("atya", "ann", Gender.FEMALE)]
+
+        for mother_name, new_member_name, new_member_gender in additions:
+            for family in (self.family, self.compact_family):
+                family.add_member(mother_name=mother_name, new_member_name=new_member_name,
+                                  new_member_gender=new_member_gender)
+            self.assertEqual(self.family.total_members, self.compact_family.total_members)
+        self.assert_same_relationships(family=self.family, other=self.compact_family)
+
+    def test_first_child_is_shared_with_spouse(self):
+        jane = CompactPerson(name="jane", gender=Gender.FEMALE)
+        john = CompactPerson(name="john", gender=Gender.MALE)
+        jane.set_spouse(spouse=john)
+        self.assertEqual(0, john.total_children)
+
+        result = jane.add_child(child=CompactPerson(name="joe", gender=Gender.MALE))
+        self.assertEqual(Responses.CHILD_ADDITION_SUCCEEDED, result)
+        self.assertIs(jane.children, john.children)
+        self.assertEqual(1, john.total_children)
+
+
+class TestColumnarFamily(TestFamily):
+
+    def setUp(self) -> None:
+        super(TestColumnarFamily, self).setUp()
+
+        self.columnar_family = ColumnarFamily.from_family(family=self.family)
+
+    def test_columnar_family_matches_family(self):
+        self.assertEqual(self.family.total_members, self.columnar_family.total_members)
+        self.assert_same_relationships(family=self.family, other=self.columnar_family)
+
+    def test_columnar_family_matches_family_after_additions_and_compaction(self):
+        additions = [("chitra", "john", Gender.MALE), ("satya", "jane", Gender.FEMALE), ("atya", "joe", Gender.MALE),
+                     ("unknown-member", "ann", Gender.FEMALE), ("vyan", "ann", Gender.FEMALE),
+                     ("lika", "vasa", Gender.MALE), ("satvy", "ann", Gender.FEMALE)]
+
+        for mother_name, new_member_name, new_member_gender in additions:
+            expected = self.family.add_member(mother_name=mother_name, new_member_name=new_member_name,
+                                              new_member_gender=new_member_gender)
+            result = self.columnar_family.add_member(mother_name=mother_name, new_member_name=new_member_name,
+                                                     new_member_gender=new_member_gender)
+            self.assertEqual(expected, result)
+        self.assert_same_relationships(family=self.family, other=self.columnar_family)
+
+        self.columnar_family.compact()
+        self.assertEqual({}, self.columnar_family.extra_children)
+        self.assert_same_relationships(family=self.family, other=self.columnar_family)
+
+    def test_get_relation_when_person_not_found(self):
+        result = self.columnar_family.get_relationship(member_name="unknown-member", relation=Relations.Mother)
+        self.assertEqual(Responses.PERSON_NOT_FOUND, result)
+
+    def test_get_relationships_returns_results_in_query_order(self):
+        queries = [(member.name, relation) for relation in Relations for member in self.family.members]
+        queries.insert(3, ("unknown-member", Relations.Siblings))
+
+        results = self.columnar_family.get_relationships(queries=iter(queries))
+        self.assertEqual(len(queries), len(results))
+        for (member_name, relation), result in zip(queries, results):
+            expected = self.columnar_family.get_relationship(member_name=member_name, relation=relation)
+            self.assertEqual(expected, result)
+
+    def test_get_relationships_resolves_every_relation_in_batch_passes(self):
+        additions = [("chitra", "john", Gender.MALE), ("satya", "jane", Gender.FEMALE), ("lika", "vasa", Gender.MALE)]
+        for mother_name, child_name, gender in additions:
+            self.family.add_member(mother_name=mother_name, new_member_name=child_name, new_member_gender=gender)
+            self.columnar_family.add_member(mother_name=mother_name, new_member_name=child_name,
+                                            new_member_gender=gender)
+        queries = [(member.name, relation) for relation in Relations for member in self.family.members]
+        expected = [self.family.get_relationship(member_name=member_name, relation=relation)
+                    for member_name, relation in queries]
+
+        def unbatched(family, index):
+            raise AssertionError("per-member relation called")
+
+        self.assertEqual(set(Relations), set(BATCH_RELATION_PICKER))
+        with mock.patch.dict(COLUMNAR_RELATION_PICKER, {relation: unbatched for relation in Relations}):
+            results = self.columnar_family.get_relationships(queries=queries)
+
+        for expected_relatives, relatives in zip(expected, results):
+            if isinstance(expected_relatives, list):
+                self.assertEqual(self.get_names_list(expected_relatives), self.get_names_list(relatives))
+            elif expected_relatives is None:
+                self.assertIsNone(relatives)
+            else:
+                self.assertEqual(expected_relatives.name, relatives.name)
+
+
+class TestSnapshot(TestFamily):
+
+    def setUp(self) -> None:
+        super(TestSnapshot, self).setUp()
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "family.snapshot")
+
+    def test_loaded_snapshot_matches_family(self):
+        self.family.add_member(mother_name="chitra", new_member_name="john", new_member_gender=Gender.MALE)
+        save_snapshot(family=self.family, path=self.path)
+
+        loaded_family = load_snapshot(path=self.path)
+        self.assertEqual(self.family.total_members, loaded_family.total_members)
+        self.assert_same_relationships(family=self.family, other=loaded_family)
+
+    def test_loaded_snapshot_accepts_new_members(self):
+        save_snapshot(family=self.family, path=self.path)
+        loaded_family = load_snapshot(path=self.path)
+
+        for family in (self.family, loaded_family):
+            result = family.add_member(mother_name="satvy", new_member_name="jane", new_member_gender=Gender.FEMALE)
+            self.assertEqual(Responses.CHILD_ADDITION_SUCCEEDED, result)
+        self.assert_same_relationships(family=self.family, other=loaded_family)
+
+    def test_load_snapshot_rejects_other_files(self):
+        with open(self.path, "wb") as file:
+            file.write(b"ADD_CHILD Chitra Aria Female\n" * 4)
+
+        with self.assertRaises(SnapshotError):
+            load_snapshot(path=self.path)
+
+    def test_load_snapshot_rejects_an_empty_file(self):
+        open(self.path, "wb").close()
+
+        with self.assertRaises(SnapshotError):
+            load_snapshot(path=self.path)
+
+    def test_load_snapshot_rejects_a_corrupted_section(self):
+        save_snapshot(family=self.family, path=self.path)
+        family = ColumnarFamily.from_family(family=self.family)
+        child_offsets_position = HEADER.size + 8 * ((family.total_members + 7) // 8 + 2 * family.total_members) + 8
+        with open(self.path, "r+b") as file:
+            file.seek(child_offsets_position)
+            byte = file.read(1)
+            file.seek(child_offsets_position)
+            file.write(bytes([byte[0] ^ 1]))
+
+        with self.assertRaises(SnapshotError):
+            load_snapshot(path=self.path)
+
+
+class TestProcessParallel(TestFamily):
+
+    def test_parallel_output_matches_sequential_output(self):
+        lines = []
+        for index, member in enumerate(self.family.members):
+            lines.extend(f"GET_RELATIONSHIP {member.name} {relation.value}\n" for relation in Relations)
+            if index % 5 == 0:
+                lines.append(f"ADD_CHILD {member.name} child{index} {Gender.FEMALE.value}\n")
+                lines.append(f"GET_RELATIONSHIP child{index} Siblings\n")
+
+        expected = io.StringIO()
+        process(lines=lines, family=Family(), stream=expected)
+
+        result = io.StringIO()
+        process_parallel(lines=lines, family=self.family, stream=result, workers=2, chunk_size=7)
+        self.assertEqual(expected.getvalue(), result.getvalue())
+
+    def test_output_is_written_before_the_input_is_exhausted(self):
+        names = [member.name for member in self.family.members]
+        lines = [f"ADD_CHILD Chitra child{index} {Gender.MALE.value}\n" if index % 100 == 0
+                 else f"GET_RELATIONSHIP {names[index % len(names)]} Siblings\n" for index in range(2_000)]
+        consumed = []
+
+        def read_lines():
+            for line in lines:
+                consumed.append(line)
+                yield line
+
+        class RecordingStream(io.StringIO):
+            def write(self, text: str) -> int:
+                written.append(len(consumed))
+                return super().write(text)
+
+        written = []
+        result = RecordingStream()
+        process_parallel(lines=read_lines(), family=self.family, stream=result, workers=2, chunk_size=2_000)
+
+        expected = io.StringIO()
+        process(lines=lines, family=Family(), stream=expected)
+        self.assertEqual(expected.getvalue(), result.getvalue())
+        self.assertLess(written[0], len(lines) // 10)
+
+
+class TestFamilyServer(TestFamily):
+
+    async def exchange(self, requests: bytes, expected_lines: int) -> List[bytes]:
+        server = await FamilyServer(family=self.family).start()
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection(host="127.0.0.1", port=port)
+            writer.write(requests)
+            await writer.drain()
+            responses = [await reader.readline() for _ in range(expected_lines)]
+            writer.close()
+            await writer.wait_closed()
+        return responses
+
+    def test_server_answers_pipelined_requests_in_order(self):
+        requests = (b"ADD_CHILD Chitra Aria Female\n"
+                    b"GET_RELATIONSHIP Lavnya Maternal-Aunt\n"
+                    b"GET_RELATIONSHIP Aria Siblings\n"
+                    b"GET_RELATIONSHIP Aria Cousin\n"
+                    b"ADD_CHILD Pjali Srutak Male\n")
+        responses = asyncio.run(self.exchange(requests=requests, expected_lines=5))
+
+        expected = [b"CHILD_ADDITION_SUCCEEDED\n", b"Aria \n", b"Jnki Ahit \n", b"INVALID_COMMAND\n",
+                    b"PERSON_NOT_FOUND\n"]
+        self.assertEqual(expected, responses)
+        self.assertIsNotNone(self.family.member_exists(person_name="aria"))
+
+    def test_server_answers_complete_lines_before_the_rest_arrives(self):
+        async def exchange() -> List[bytes]:
+            server = await FamilyServer(family=self.family).start()
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                reader, writer = await asyncio.open_connection(host="127.0.0.1", port=port)
+                writer.write(b"GET_RELATIONSHIP Lavnya Mother\nGET_RELATIONSHIP Ish Bro")
+                await writer.drain()
+                responses = [await asyncio.wait_for(reader.readline(), timeout=5)]
+                writer.write(b"ther\n")
+                await writer.drain()
+                responses.append(await asyncio.wait_for(reader.readline(), timeout=5))
+                writer.close()
+                await writer.wait_closed()
+            return responses
+
+        self.assertEqual([b"Jnki \n", b"Chit Vich Aras \n"], asyncio.run(exchange()))
+
+    def test_server_rejects_undecodable_and_unknown_commands_without_closing(self):
+        requests = b"\xff\xfe bad\nBOGUS Ish\nGET_RELATIONSHIP Lavnya Mother\n"
+        responses = asyncio.run(self.exchange(requests=requests, expected_lines=3))
+
+        self.assertEqual([b"INVALID_COMMAND\n", b"INVALID_COMMAND\n", b"Jnki \n"], responses)
+
+
+class TestGrowFamily(TestFamily):
+
+    def test_grow_family_stops_at_requested_depth(self):
+        mothers = [member for member in self.family.members if member.gender is Gender.FEMALE and member.spouse]
+
+        grow_family(family=self.family, count=10_000, fan_out=2, depth=1)
+        self.assertEqual(31 + len(mothers) * 2 * 2, self.family.total_members)
+
+    def test_grow_family_stops_at_requested_size(self):
+        grow_family(family=self.family, count=500, fan_out=3)
+        self.assertGreaterEqual(self.family.total_members, 500)
+        self.assertLess(self.family.total_members, 500 + 2 * 3)
+
+
+class TestCousins(TestFamily):
+
+    def setUp(self) -> None:
+        super(TestCousins, self).setUp()
+
+        self.relation = Relations.Cousins
+
+    def test_get_cousins_when_parents_do_not_have_siblings(self):
+        result = self.family.get_relationship(member_name="chit", relation=self.relation)
+        self.assertIsNone(result)
+
+    def test_get_cousins_when_cousins_exists(self):
+        expected_names = ["Dritha", "Tritha", "Vritha", "Jnki", "Ahit", "Asva", "Vyas", "Atya"]
+
+        result = self.family.get_relationship(member_name="vila", relation=self.relation)
+        self.assertEqual(expected_names, self.get_names_list(result=result))
+
+
+class TestGrandparents(TestFamily):
+
+    def test_get_grandparents_when_grandparents_exists(self):
+        result = self.family.get_relationship(member_name="yodhan", relation=Relations.Grandparents)
+        self.assertEqual(["Amba", "Chit"], self.get_names_list(result=result))
+
+    def test_get_grandchildren_when_grandchildren_exists(self):
+        expected_names = ["Dritha", "Tritha", "Vritha", "Vila", "Chika", "Jnki", "Ahit", "Asva", "Vyas", "Atya"]
+
+        result = self.family.get_relationship(member_name="anga", relation=Relations.Grandchildren)
+        self.assertEqual(expected_names, self.get_names_list(result=result))
+
+
+class TestPaths(TestFamily):
+
+    def test_compiled_plan_modes_agree(self):
+        plan = repeat(children, 2).compile()
+        anga = self.family.member_exists(person_name="anga")
+
+        self.assertEqual(plan.all(anga), list(plan.iter(anga)))
+        self.assertIs(plan.all(anga)[0], plan.first(anga))
+
+    def test_union_evaluates_shared_single_valued_prefix_once(self):
+        plan = (Path(mother, mother) | Path(mother, spouse)).compile()
+
+        self.assertEqual(2, plan.sources["all"].count(".mother\n"))
+        yodhan = self.family.member_exists(person_name="yodhan")
+        self.assertEqual(["Amba", "Jaya"], self.get_names_list(result=plan.all(yodhan)))
+
+
+class TestLineage(TestFamily):
+
+    def test_is_descendant(self):
+        self.assertEqual(Responses.YES, self.family.is_descendant(member_name="yodhan", ancestor_name="shan"))
+        self.assertEqual(Responses.YES, self.family.is_descendant(member_name="yodhan", ancestor_name="amba"))
+        self.assertEqual(Responses.NO, self.family.is_descendant(member_name="yodhan", ancestor_name="satya"))
+        self.assertEqual(Responses.NO, self.family.is_descendant(member_name="shan", ancestor_name="yodhan"))
+        self.assertEqual(Responses.NO, self.family.is_descendant(member_name="dritha", ancestor_name="jaya"))
+        self.assertEqual(Responses.NO, self.family.is_descendant(member_name="amba", ancestor_name="shan"))
+
+    def test_is_descendant_when_person_not_found(self):
+        result = self.family.is_descendant(member_name="unknown-member", ancestor_name="shan")
+        self.assertEqual(Responses.PERSON_NOT_FOUND, result)
+
+    def test_get_generation_places_spouses_in_their_partners_generation(self):
+        self.assertEqual(0, self.family.get_generation(member_name="shan"))
+        self.assertEqual(1, self.family.get_generation(member_name="amba"))
+        self.assertEqual(3, self.family.get_generation(member_name="yodhan"))
+
+    def test_get_common_ancestors(self):
+        result = self.family.get_common_ancestors(member_name="yodhan", other_member_name="laki")
+        self.assertEqual(["Anga", "Shan"], self.get_names_list(result=result))
+
+        result = self.family.get_common_ancestors(member_name="yodhan", other_member_name="tritha")
+        self.assertEqual(["Chit", "Amba"], self.get_names_list(result=result))
+
+    def test_lineage_is_maintained_on_add_member(self):
+        self.family.add_member(mother_name="dritha", new_member_name="john", new_member_gender=Gender.MALE)
+
+        self.assertEqual(3, self.family.get_generation(member_name="john"))
+        self.assertEqual(Responses.YES, self.family.is_descendant(member_name="john", ancestor_name="jaya"))
+        result = self.family.get_common_ancestors(member_name="john", other_member_name="yodhan")
+        self.assertEqual(["Dritha", "Jaya"], self.get_names_list(result=result))
+
+    def test_lineage_agrees_with_walking_the_tree(self):
+        grow_family(family=self.family, count=2_000, fan_out=2)
+
+        def ancestors(person: Person) -> List[Person]:
+            found = []
+            while person.mother:
+                found.extend([person.mother, person.mother.spouse])
+                person = person.mother if person.mother.mother or not person.mother.spouse.mother \
+                    else person.mother.spouse
+            return found
+
+        members = self.family.members[::37]
+        for member in members:
+            for other in members:
+                expected = Responses.YES if other in ancestors(member) else Responses.NO
+                result = self.family.is_descendant(member_name=member.name, ancestor_name=other.name)
+                self.assertEqual(expected, result)
+
+    def test_walked_lineage_matches_lineage_index(self):
+        grow_family(family=self.family, count=600, fan_out=2)
+        members = self.family.members[::23]
+        with tempfile.TemporaryDirectory() as directory:
+            durable_family = DurableFamily(directory=directory)
+            self.addCleanup(durable_family.close)
+            durable_family.family = ColumnarFamily.from_family(family=self.family)
+            for other_family in (ColumnarFamily.from_family(family=self.family), durable_family):
+                for member in members:
+                    self.assertEqual(self.family.get_generation(member_name=member.name),
+                                     other_family.get_generation(member_name=member.name))
+                    for other in members:
+                        self.assertEqual(self.family.is_descendant(member_name=member.name, ancestor_name=other.name),
+                                         other_family.is_descendant(member_name=member.name, ancestor_name=other.name))
+                        expected = self.family.get_common_ancestors(member_name=member.name,
+                                                                    other_member_name=other.name)
+                        result = other_family.get_common_ancestors(member_name=member.name,
+                                                                   other_member_name=other.name)
+                        self.assertEqual(self.get_names_list(result=expected or []),
+                                         self.get_names_list(result=result or []))
+
+    def test_lineage_commands_through_snapshot_backed_main(self):
+        lines = ["ADD_CHILD Satvy Aria Female\n", "GET_GENERATION Vasa\n", "GET_GENERATION Aria\n",
+                 "GET_GENERATION Nobody\n", "IS_DESCENDANT Aria Shan\n", "IS_DESCENDANT Aria Amba\n",
+                 "GET_COMMON_ANCESTOR Aria Yodhan\n", "GET_COMMON_ANCESTOR Aria Vasa\n"]
+        expected = io.StringIO()
+        process(lines=lines, family=self.family, stream=expected)
+
+        with tempfile.TemporaryDirectory() as directory:
+            commands_path = os.path.join(directory, "commands.txt")
+            snapshot_path = os.path.join(directory, "family.snapshot")
+            with open(commands_path, "w") as file:
+                file.writelines(lines)
+            save_snapshot(family=Family(), path=snapshot_path)
+
+            script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "geektrust.py")
+            completed = subprocess.run([sys.executable, script, commands_path, snapshot_path],
+                                       stdout=subprocess.PIPE, check=True)
+
+        self.assertEqual(expected.getvalue().encode(), completed.stdout)
+        self.assertIn(b"Anga Shan \n", completed.stdout)
+
+
+class TestVersionedFamily(TestFamily):
+
+    def setUp(self) -> None:
+        super(TestVersionedFamily, self).setUp()
+
+        self.versioned_family = VersionedFamily(family=self.family)
+
+    def test_snapshot_does_not_see_later_additions(self):
+        snapshot = self.versioned_family.snapshot()
+        self.versioned_family.add_member(mother_name="anga", new_member_name="john", new_member_gender=Gender.MALE)
+        latest = self.versioned_family.snapshot()
+
+        self.assertEqual(latest.total_members, snapshot.total_members + 1)
+        self.assertIsNone(snapshot.member_exists(person_name="john"))
+        self.assertEqual(Responses.PERSON_NOT_FOUND, snapshot.get_relationship(member_name="john",
+                                                                               relation=Relations.Mother))
+        result = snapshot.get_relationship(member_name="ish", relation=Relations.Siblings)
+        self.assertEqual(["Chit", "Vich", "Aras", "Satya"], self.get_names_list(result=result))
+
+        result = latest.get_relationship(member_name="ish", relation=Relations.Siblings)
+        self.assertEqual(["Chit", "Vich", "Aras", "Satya", "John"], self.get_names_list(result=result))
+
+    def test_snapshot_matches_family_at_the_same_version(self):
+        self.versioned_family.add_member(mother_name="satya", new_member_name="jane", new_member_gender=Gender.FEMALE)
+        snapshot = self.versioned_family.snapshot()
+        expected_family = Family()
+        expected_family.add_member(mother_name="satya", new_member_name="jane", new_member_gender=Gender.FEMALE)
+
+        self.versioned_family.add_member(mother_name="satya", new_member_name="joe", new_member_gender=Gender.MALE)
+        self.versioned_family.add_member(mother_name="jnki", new_member_name="ann", new_member_gender=Gender.FEMALE)
+        self.assert_same_relationships(family=expected_family, other=snapshot)
+
+    def test_snapshot_uses_the_family_relation_picker(self):
+        snapshot = VersionedFamily(family=Family(person_class=SummarizedPerson)).snapshot()
+        expected = [self.family.get_relationship(member_name=member.name, relation=relation)
+                    for member in self.family.members for relation in Relations]
+
+        def unsummarized(member):
+            raise AssertionError("generic relation class used for a summarized family")
+
+        with mock.patch.dict(RELATION_CLASS_PICKER, {relation: unsummarized for relation in Relations}):
+            results = [snapshot.get_relationship(member_name=member.name, relation=relation)
+                       for member in self.family.members for relation in Relations]
+
+        def names(result):
+            return self.get_names_list(result) if isinstance(result, list) else getattr(result, "name", result)
+
+        self.assertEqual([names(result) for result in expected], [names(result) for result in results])
+
+    def test_readers_see_consistent_snapshots_while_a_writer_appends(self):
+        errors = []
+
+        def write():
+            for index in range(300):
+                self.versioned_family.add_member(mother_name="anga", new_member_name=f"child{index}",
+                                                 new_member_gender=Gender.MALE)
+
+        def read():
+            for _ in range(300):
+                snapshot = self.versioned_family.snapshot()
+                siblings = snapshot.get_relationship(member_name="ish", relation=Relations.Siblings)
+                if len(siblings) != snapshot.total_members - 31 + 4:
+                    errors.append((len(siblings), snapshot.total_members))
+
+        threads = [threading.Thread(target=write)] + [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], errors)
+        self.assertEqual(31 + 300, self.versioned_family.snapshot().total_members)
+
+
+class TestDurableFamily(TestFamily):
+
+    def setUp(self) -> None:
+        super(TestDurableFamily, self).setUp()
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.additions = [("chitra", "john", Gender.MALE), ("vyan", "jane", Gender.FEMALE),
+                          ("satya", "jane", Gender.FEMALE), ("lika", "ann", Gender.FEMALE)]
+
+    def open_family(self, **options) -> DurableFamily:
+        durable_family = DurableFamily(directory=self.directory, **options)
+        self.addCleanup(durable_family.close)
+        return durable_family
+
+    def add_members(self, family) -> List[Responses]:
+        return [family.add_member(mother_name=mother_name, new_member_name=new_member_name,
+                                  new_member_gender=new_member_gender)
+                for mother_name, new_member_name, new_member_gender in self.additions]
+
+    def test_family_is_recovered_from_log(self):
+        durable_family = self.open_family()
+        self.assertEqual(self.add_members(family=self.family), self.add_members(family=durable_family))
+        durable_family.close()
+
+        records, _ = read_log(path=os.path.join(self.directory, LOG_FILE))
+        self.assertEqual(3, len(records))
+
+        recovered_family = self.open_family()
+        self.assertEqual(self.family.total_members, recovered_family.total_members)
+        self.assert_same_relationships(family=self.family, other=recovered_family)
+
+    def test_family_is_recovered_from_snapshot_and_log_tail(self):
+        durable_family = self.open_family(compact_every=2)
+        self.add_members(family=self.family)
+        self.add_members(family=durable_family)
+        durable_family.close()
+
+        self.assertTrue(os.path.exists(os.path.join(self.directory, SNAPSHOT_FILE)))
+        records, _ = read_log(path=os.path.join(self.directory, LOG_FILE))
+        self.assertEqual([("lika", "ann", Gender.FEMALE)], records)
+
+        recovered_family = self.open_family(compact_every=2)
+        self.assert_same_relationships(family=self.family, other=recovered_family)
+
+    def test_torn_log_tail_is_discarded(self):
+        durable_family = self.open_family()
+        self.add_members(family=durable_family)
+        durable_family.close()
+
+        log_path = os.path.join(self.directory, LOG_FILE)
+        _, valid_length = read_log(path=log_path)
+        with open(log_path, "r+b") as file:
+            file.truncate(valid_length - 3)
+
+        recovered_family = self.open_family()
+        self.assertIsNotNone(recovered_family.member_exists(person_name="jane"))
+        self.assertIsNone(recovered_family.member_exists(person_name="ann"))
+
+        recovered_family.add_member(mother_name="lika", new_member_name="ann", new_member_gender=Gender.FEMALE)
+        recovered_family.close()
+        records, _ = read_log(path=log_path)
+        self.assertEqual(["John", "Jane", "Ann"], [new_member_name.capitalize() for _, new_member_name, _ in records])
+
+    def test_acknowledged_additions_survive_a_process_crash(self):
+        code = ("import os, sys; sys.path.insert(0, sys.argv[1]); from person import Gender; "
+                "from wal import DurableFamily; family = DurableFamily(directory=sys.argv[2], group_commit_size=1000, "
+                "group_commit_interval=3600); "
+                "[family.add_member(mother_name=mother, new_member_name=name, new_member_gender=Gender.MALE) "
+                "for mother, name in (('chitra', 'john'), ('satya', 'joe'))]; os._exit(0)")
+        subprocess.run([sys.executable, "-c", code, os.path.dirname(os.path.abspath(__file__)), self.directory],
+                       check=True)
+
+        recovered_family = self.open_family()
+        self.assertIsNotNone(recovered_family.member_exists(person_name="john"))
+        self.assertIsNotNone(recovered_family.member_exists(person_name="joe"))
+
+
+class TestFamilyRegistry(TestFamily):
+
+    def setUp(self) -> None:
+        super(TestFamilyRegistry, self).setUp()
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.registry = FamilyRegistry(directory=directory.name)
+        self.registry.create(family_id="first")
+        self.registry.create(family_id="second")
+
+    def test_commands_are_routed_by_family_id(self):
+        lines = ["first ADD_CHILD Chitra Aria Female\n", "first GET_RELATIONSHIP Aria Siblings\n",
+                 "second GET_RELATIONSHIP Aria Siblings\n", "third GET_RELATIONSHIP Aria Siblings\n",
+                 "../first GET_RELATIONSHIP Aria Siblings\n"]
+        stream = io.StringIO()
+        process_tenants(lines=lines, registry=self.registry, stream=stream)
+
+        expected = "CHILD_ADDITION_SUCCEEDED\nJnki Ahit \nPERSON_NOT_FOUND\nFAMILY_NOT_FOUND\nFAMILY_NOT_FOUND\n"
+        self.assertEqual(expected, stream.getvalue())
+
+    def test_families_share_interned_names(self):
+        first, second = self.registry.get(family_id="first"), self.registry.get(family_id="second")
+        self.assertIs(first.names[0], second.names[0])
+
+    def test_idle_families_are_evicted_and_reloaded_with_their_changes(self):
+        self.registry.execute(family_id="first", words=["ADD_CHILD", "Chitra", "Aria", "Female"])
+        self.registry.memory_budget = self.registry.sizes["second"]
+
+        self.registry.get(family_id="second")
+        self.assertEqual(["second"], list(self.registry.loaded))
+
+        first = self.registry.get(family_id="first")
+        self.assertEqual(["first"], list(self.registry.loaded))
+        self.assertIsNotNone(first.member_exists(person_name="aria"))
+
+    def test_recreating_a_loaded_family_keeps_the_byte_count(self):
+        self.registry.execute(family_id="first", words=["ADD_CHILD", "Chitra", "Aria", "Female"])
+        self.registry.create(family_id="first")
+
+        self.assertEqual(sum(self.registry.sizes.values()), self.registry.loaded_bytes)
+        self.assertEqual(set(), self.registry.dirty)
+        self.assertIsNone(self.registry.get(family_id="first").member_exists(person_name="aria"))
+
+
+class TestSummarizedPerson(TestFamily):
+
+    def setUp(self) -> None:
+        super(TestSummarizedPerson, self).setUp()
+
+        self.summarized_family = Family(person_class=SummarizedPerson)
+
+    def test_summarized_family_matches_family(self):
+        self.assert_same_relationships(family=self.family, other=self.summarized_family)
+
+    def test_summaries_are_updated_on_add_member(self):
+        for family in (self.family, self.summarized_family):
+            grow_family(family=family, count=300, fan_out=3)
+            family.add_members(records=[("anga", "john", Gender.MALE), ("anga", "jane", Gender.FEMALE)])
+        self.assert_same_relationships(family=self.family, other=self.summarized_family)
+
+    def test_summarized_relationships_return_copies(self):
+        result = self.summarized_family.get_relationship(member_name="ish", relation=Relations.Brother)
+        result.clear()
+
+        result = self.summarized_family.get_relationship(member_name="ish", relation=Relations.Brother)
+        self.assertEqual(["Chit", "Vich", "Aras"], self.get_names_list(result=result))
+
+
+class TestWorkload(TestFamily):
+
+    def test_generated_workload_is_deterministic(self):
+        first = generate_family(members=2_000, seed=7)
+        second = generate_family(members=2_000, seed=7)
+        self.assertEqual(self.get_names_list(result=first.members), self.get_names_list(result=second.members))
+        self.assertEqual(generate_commands(family=first, commands=500, seed=7),
+                         generate_commands(family=second, commands=500, seed=7))
+
+    def test_generated_family_follows_family_rules(self):
+        family = generate_family(members=2_000, seed=3, max_children=3, depth=4)
+        seed_generations = max(self.family.get_generation(member_name=member.name) for member in self.family.members)
+        for member in family.members[self.family.total_members:]:
+            if member.mother:
+                self.assertIs(Gender.FEMALE, member.mother.gender)
+                self.assertIsNotNone(member.mother.spouse)
+            self.assertLessEqual(family.get_generation(member_name=member.name), seed_generations + 4)
+
+    def test_replay_matches_processing_the_generated_family(self):
+        family = generate_family(members=1_000, seed=1)
+        lines = generate_commands(family=family, commands=2_000, seed=1, add_ratio=0.05)
+        expected = io.StringIO()
+        process(lines=lines, family=family, stream=expected)
+
+        with tempfile.TemporaryDirectory() as directory:
+            paths = write_workload(directory=directory, members=1_000, commands=2_000, seed=1, add_ratio=0.05)
+            output = io.BytesIO()
+            report = replay(commands_path=paths["commands"], snapshot_path=paths["snapshot"], stream=output)
+
+        self.assertEqual(2_000, report["commands"])
+        self.assertEqual(expected.getvalue().encode(), output.getvalue())
+        self.assertEqual(len(output.getvalue()), report["output_bytes"])
+
+
+class TestConcurrentFamily(TestFamily):
+
+    def setUp(self) -> None:
+        super(TestConcurrentFamily, self).setUp()
+
+        self.concurrent_family = ConcurrentFamily(family=Family(relation_cache_size=64))
+
+    def run_threads(self, target, count: int = 8):
+        threads = [threading.Thread(target=target, args=(index,)) for index in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_concurrent_additions_keep_names_unique(self):
+        statuses = []
+        mothers = ["anga", "satya", "chitra", "jnki", "krpi", "lika"]
+
+        def work(index: int):
+            for step in range(200):
+                mother = mothers[(index + step) % len(mothers)]
+                statuses.append(self.concurrent_family.add_member(mother_name=mother, new_member_name=f"shared{step}",
+                                                                  new_member_gender=Gender.MALE))
+                self.concurrent_family.add_member(mother_name=mother, new_member_name=f"own{index}x{step}",
+                                                  new_member_gender=Gender.FEMALE)
+                self.concurrent_family.get_relationship(member_name=f"shared{step}", relation=Relations.Siblings)
+
+        self.run_threads(target=work)
+
+        family = self.concurrent_family.family
+        self.assertEqual(200, statuses.count(Responses.CHILD_ADDITION_SUCCEEDED))
+        self.assertEqual(31 + 200 + 8 * 200, family.total_members)
+        self.assertEqual(len(family.members), len({id(member) for member in family.members}))
+        for member in family.members[31:]:
+            self.assertEqual(1, sum(child is member for child in member.mother.children))
+        self.assert_same_relationships(family=family, other=ConcurrentFamily(family=family))
+
+    def test_concurrent_marriages_pick_one_spouse(self):
+        self.concurrent_family.add_member(mother_name="anga", new_member_name="john", new_member_gender=Gender.MALE)
+        spouses = []
+
+        def marry(index: int):
+            spouses.append(self.concurrent_family.add_spouse(member_name="john", spouse_name=f"jane{index}",
+                                                             spouse_gender=Gender.FEMALE))
+
+        self.run_threads(target=marry)
+
+        married = [spouse for spouse in spouses if spouse]
+        self.assertEqual(1, len(married))
+        self.assertIs(married[0], self.concurrent_family.member_exists(person_name="john").spouse)
+        self.assertEqual(Responses.CHILD_ADDITION_SUCCEEDED, self.concurrent_family.add_member(
+            mother_name=married[0].name, new_member_name="jill", new_member_gender=Gender.FEMALE))
+
+
+class TestShardedFamily(TestFamily):
+
+    def setUp(self) -> None:
+        super(TestShardedFamily, self).setUp()
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.paths = export_shards(family=self.family, roots=["satya", "chitra", "dritha"],
+                                   directory=self.directory.name)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_shards_partition_the_family(self):
+        shards = [load_shard(path=path) for path in self.paths]
+
+        owned = [name for shard in shards for name in shard.members]
+        self.assertEqual(sorted(self.get_names_list(result=self.family.members)), sorted(owned))
+        self.assertEqual(["Asva", "Atya", "Krithi", "Kriya", "Krpi", "Satvy", "Satya", "Vasa", "Vyan", "Vyas"],
+                         sorted(shards[1].members))
+        self.assertEqual(["Anga"], sorted(shards[1].stubs))
+        self.assertEqual(["Aras", "Dritha", "Satya"], sorted(shards[0].stubs))
+
+    def test_export_rejects_roots_that_are_not_matriarchs(self):
+        for root in ("ish", "tritha", "nobody"):
+            with self.assertRaises(ValueError):
+                export_shards(family=self.family, roots=[root], directory=self.directory.name)
+
+    def test_sharded_family_matches_family(self):
+        lines = ["ADD_CHILD Chitra Aria Female\n", "ADD_CHILD Satya Zed Male\n", "ADD_CHILD Aria Joe Male\n",
+                 "ADD_CHILD Dritha Aria Male\n", "ADD_CHILD Pjali Srutak Male\n", "GET_RELATIONSHIP Pjali Son\n",
+                 "GET_GENERATION Joe\n", "IS_DESCENDANT Joe Anga\n", "IS_DESCENDANT Zed Chitra\n",
+                 "GET_COMMON_ANCESTOR Joe Zed\n", "GET_COMMON_ANCESTOR Joe Laki\n"]
+        lines += [f"GET_RELATIONSHIP {member.name} {relation.value}\n"
+                  for member in self.family.members + [Person(name="aria", gender=Gender.FEMALE)]
+                  for relation in Relations]
+        expected = io.StringIO()
+        process(lines=lines, family=self.family, stream=expected)
+
+        for separate_processes in (False, True):
+            sharded_family = ShardedFamily(paths=self.paths, separate_processes=separate_processes)
+            try:
+                result = io.StringIO()
+                process(lines=lines, family=sharded_family, stream=result)
+            finally:
+                sharded_family.close()
+
+            self.assertEqual(expected.getvalue(), result.getvalue())
+            self.assertGreater(sharded_family.stitched, 0)
+            self.assertEqual(self.family.total_members, sharded_family.total_members)
+
+    def test_shard_files_are_routed_by_shard_id_in_any_order(self):
+        grow_family(family=self.family, count=400, fan_out=2)
+        roots = [member.name for member in self.family.members[31:]
+                 if member.gender is Gender.FEMALE and member.spouse][:12]
+        paths = sorted(export_shards(family=self.family, roots=roots, directory=self.directory.name))
+        self.assertEqual(13, len(paths))
+        self.assertNotEqual(paths, sorted(paths, key=lambda path: int(os.path.basename(path).split(".")[0])))
+
+        lines = [f"GET_RELATIONSHIP {member.name} {relation.value}\n"
+                 for member in self.family.members for relation in (Relations.Mother, Relations.Siblings)]
+        expected = io.StringIO()
+        process(lines=lines, family=self.family, stream=expected)
+
+        sharded_family = ShardedFamily(paths=paths)
+        self.addCleanup(sharded_family.close)
+        result = io.StringIO()
+        process(lines=lines, family=sharded_family, stream=result)
+        self.assertEqual(expected.getvalue(), result.getvalue())
@@ -0,0 +1,60 @@
+import threading
+from enum import Enum
+from typing import Dict, List, Optional, Union
+
+from constants import Responses
+from family import Family
+from person import Person
+
+INVISIBLE = float("inf")
+
+
+class FamilySnapshot:
+
+    def __init__(self, family: Family, versions: Dict[Person, int], version: int):
+        self.family = family
+        self.versions = versions
+        self.version = version
+
+    @property
+    def total_members(self) -> int:
+        return self.version
+
+    def __visible(self, member: Person) -> bool:
+        return self.versions.get(member, INVISIBLE) < self.version
+
+    def member_exists(self, person_name: str) -> Optional[Person]:
+        member = self.family.member_exists(person_name=person_name)
+        return member if member and self.__visible(member=member) else None
+
+    def get_relationship(self, member_name: str, relation: Enum) -> Optional[Union[Enum, List]]:
+        member = self.member_exists(person_name=member_name)
+        if not member:
+            return Responses.PERSON_NOT_FOUND
+
+        relatives = self.family.relation_picker.get(relation)(member).relatives()
+        if isinstance(relatives, list):
+            relatives = [relative for relative in relatives if self.__visible(member=relative)]
+        return relatives if relatives else None
+
+
+class VersionedFamily:
+
+    def __init__(self, family: Family = None):
+        self.family = family or Family()
+        self.versions = {member: index for index, member in enumerate(self.family.members)}
+        self.version = len(self.family.members)
+        self.__write_lock = threading.Lock()
+
+    def snapshot(self) -> FamilySnapshot:
+        return FamilySnapshot(family=self.family, versions=self.versions, version=self.version)
+
+    def add_member(self, mother_name: str, new_member_name: str, new_member_gender: Enum) -> Enum:
+        with self.__write_lock:
+            status = self.family.add_member(mother_name=mother_name, new_member_name=new_member_name,
+                                            new_member_gender=new_member_gender)
+            if status == Responses.CHILD_ADDITION_SUCCEEDED:
+                self.versions[self.family.members[-1]] = self.version
+                self.version += 1
+
+            return status
@@ -0,0 +1,177 @@
+import os
+import struct
+import threading
+import time
+import zlib
+from enum import Enum
+from typing import List, Optional, Tuple, Union
+
+from columnar import ColumnarFamily
+from constants import Responses
+from family import Family
+from lineage import WalkedLineage
+from person import Gender
+from snapshot import load_snapshot, save_snapshot
+
+RECORD_HEADER = struct.Struct("<II")
+FIELD_SEPARATOR = "\t"
+SNAPSHOT_FILE = "family.snapshot"
+LOG_FILE = "family.wal"
+
+Record = Tuple[str, str, Enum]
+
+
+def encode_record(mother_name: str, new_member_name: str, new_member_gender: Enum) -> bytes:
+    payload = FIELD_SEPARATOR.join([mother_name, new_member_name, new_member_gender.value]).encode("utf-8")
+    return RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_log(path: str) -> Tuple[List[Record], int]:
+    records = []
+    if not os.path.exists(path):
+        return records, 0
+
+    with open(path, "rb") as file:
+        data = file.read()
+
+    offset = 0
+    while offset + RECORD_HEADER.size <= len(data):
+        length, checksum = RECORD_HEADER.unpack_from(data, offset)
+        payload = data[offset + RECORD_HEADER.size:offset + RECORD_HEADER.size + length]
+        if len(payload) != length or zlib.crc32(payload) != checksum:
+            break
+
+        mother_name, new_member_name, gender = payload.decode("utf-8").split(FIELD_SEPARATOR)
+        records.append((mother_name, new_member_name, Gender(gender)))
+        offset += RECORD_HEADER.size + length
+
+    return records, offset
+
+
+def fsync_path(path: str):
+    descriptor = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+class WriteAheadLog:
+
+    def __init__(self, path: str, group_commit_size: int = 64, group_commit_interval: float = 0.01):
+        self.path = path
+        self.group_commit_size = group_commit_size
+        self.group_commit_interval = group_commit_interval
+        self.file = open(path, "ab")
+        self.pending = 0
+        self.last_sync = time.monotonic()
+        self.lock = threading.Lock()
+        self.closed = threading.Event()
+        self.flusher = threading.Thread(target=self.__sync_periodically, daemon=True)
+        self.flusher.start()
+
+    def __sync_periodically(self):
+        while not self.closed.wait(timeout=self.group_commit_interval):
+            with self.lock:
+                if not self.file.closed:
+                    self.__sync()
+
+    def append(self, mother_name: str, new_member_name: str, new_member_gender: Enum):
+        with self.lock:
+            self.file.write(encode_record(mother_name=mother_name, new_member_name=new_member_name,
+                                          new_member_gender=new_member_gender))
+            self.file.flush()
+            self.pending += 1
+            if self.pending >= self.group_commit_size or \
+                    time.monotonic() - self.last_sync >= self.group_commit_interval:
+                self.__sync()
+
+    def __sync(self):
+        if self.pending:
+            os.fsync(self.file.fileno())
+            self.pending = 0
+        self.last_sync = time.monotonic()
+
+    def sync(self):
+        with self.lock:
+            self.__sync()
+
+    def truncate(self, length: int = 0):
+        with self.lock:
+            self.file.flush()
+            self.file.truncate(length)
+            os.fsync(self.file.fileno())
+            self.pending = 0
+
+    def close(self):
+        if self.file.closed:
+            return
+
+        self.closed.set()
+        self.flusher.join()
+        with self.lock:
+            self.__sync()
+            self.file.close()
+
+
+class DurableFamily(WalkedLineage):
+
+    def __init__(self, directory: str, compact_every: int = 1_000_000, group_commit_size: int = 64,
+                 group_commit_interval: float = 0.01):
+        self.directory = directory
+        self.compact_every = compact_every
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.log_path = os.path.join(directory, LOG_FILE)
+        os.makedirs(directory, exist_ok=True)
+
+        if os.path.exists(self.snapshot_path):
+            self.family = load_snapshot(path=self.snapshot_path)
+        else:
+            self.family = ColumnarFamily.from_family(family=Family())
+
+        records, valid_length = read_log(path=self.log_path)
+        for mother_name, new_member_name, new_member_gender in records:
+            self.family.add_member(mother_name=mother_name, new_member_name=new_member_name,
+                                   new_member_gender=new_member_gender)
+
+        self.log = WriteAheadLog(path=self.log_path, group_commit_size=group_commit_size,
+                                 group_commit_interval=group_commit_interval)
+        if os.path.getsize(self.log_path) != valid_length:
+            self.log.truncate(length=valid_length)
+        self.logged = len(records)
+
+    @property
+    def total_members(self) -> int:
+        return self.family.total_members
+
+    def member_exists(self, person_name: str):
+        return self.family.member_exists(person_name=person_name)
+
+    def get_relationship(self, member_name: str, relation: Enum) -> Optional[Union[Enum, List]]:
+        return self.family.get_relationship(member_name=member_name, relation=relation)
+
+    def add_member(self, mother_name: str, new_member_name: str, new_member_gender: Enum) -> Enum:
+        status = self.family.add_member(mother_name=mother_name, new_member_name=new_member_name,
+                                        new_member_gender=new_member_gender)
+        if status == Responses.CHILD_ADDITION_SUCCEEDED:
+            self.log.append(mother_name=mother_name, new_member_name=new_member_name,
+                            new_member_gender=new_member_gender)
+            self.logged += 1
+            if self.logged >= self.compact_every:
+                self.compact()
+
+        return status
+
+    def compact(self):
+        self.log.sync()
+        temporary_path = self.snapshot_path + ".tmp"
+        save_snapshot(family=self.family, path=temporary_path)
+        fsync_path(path=temporary_path)
+        os.replace(temporary_path, self.snapshot_path)
+        fsync_path(path=self.directory)
+
+        self.log.truncate()
+        self.logged = 0
+
+    def close(self):
+        self.log.close()
@@ -0,0 +1,143 @@
+import argparse
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import BinaryIO, Dict, List, Optional
+
+from benchmarks import grow_family
+from constants import Operations, Relations
+from family import Family
+from geektrust import process_bytes
+from person import Gender
+from snapshot import load_snapshot, save_snapshot
+
+GEEKTRUST_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "geektrust.py")
+
+
+def generate_family(members: int, seed: int = 0, female_ratio: float = 0.5, marriage_rate: float = 0.7,
+                    max_children: int = 4, depth: Optional[int] = None) -> Family:
+    return grow_family(family=Family(), count=members, fan_out=max_children, depth=depth, seed=seed,
+                       female_ratio=female_ratio, marriage_rate=marriage_rate)
+
+
+def generate_commands(family: Family, commands: int, seed: int = 0, add_ratio: float = 0.01,
+                      miss_ratio: float = 0.01) -> List[str]:
+    rng = random.Random(seed)
+    mothers = [member.name for member in family.members if member.gender is Gender.FEMALE and member.spouse]
+    names = [member.name for member in family.members]
+    relations = [relation.value for relation in Relations]
+
+    lines = []
+    for index in range(commands):
+        draw = rng.random()
+        if draw < add_ratio:
+            name = f"Child{index}"
+            gender = Gender.FEMALE if rng.random() < 0.5 else Gender.MALE
+            lines.append(f"{Operations.ADD_CHILD.value} {rng.choice(mothers)} {name} {gender.value}\n")
+            names.append(name)
+        elif draw < add_ratio + miss_ratio:
+            lines.append(f"{Operations.GET_RELATIONSHIP.value} Unknown{index} {rng.choice(relations)}\n")
+        else:
+            lines.append(f"{Operations.GET_RELATIONSHIP.value} {rng.choice(names)} {rng.choice(relations)}\n")
+
+    return lines
+
+
+def write_workload(directory: str, members: int, commands: int, seed: int = 0, **options) -> Dict[str, str]:
+    family_options = {key: options[key] for key in ("female_ratio", "marriage_rate", "max_children", "depth")
+                      if key in options}
+    command_options = {key: options[key] for key in ("add_ratio", "miss_ratio") if key in options}
+    family = generate_family(members=members, seed=seed, **family_options)
+    lines = generate_commands(family=family, commands=commands, seed=seed, **command_options)
+
+    os.makedirs(directory, exist_ok=True)
+    paths = {"snapshot": os.path.join(directory, "family.snapshot"),
+             "commands": os.path.join(directory, "commands.txt")}
+    save_snapshot(family=family, path=paths["snapshot"])
+    with open(paths["commands"], "w") as file:
+        file.writelines(lines)
+
+    return paths
+
+
+def replay(commands_path: str, snapshot_path: Optional[str] = None, stream: BinaryIO = None) -> Dict[str, float]:
+    started = time.perf_counter()
+    family = load_snapshot(path=snapshot_path) if snapshot_path else Family()
+    load_seconds = time.perf_counter() - started
+
+    with open(commands_path, "rb") as file:
+        lines = file.readlines()
+
+    stream = stream or io.BytesIO()
+    started = time.perf_counter()
+    process_bytes(lines=lines, family=family, stream=stream)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "commands": len(lines),
+        "members": family.total_members,
+        "load_seconds": load_seconds,
+        "process_seconds": elapsed,
+        "commands_per_second": len(lines) / elapsed if elapsed else 0.0,
+        "output_bytes": stream.tell(),
+    }
+
+
+def replay_process(commands_path: str, snapshot_path: Optional[str] = None) -> Dict[str, float]:
+    arguments = [sys.executable, GEEKTRUST_SCRIPT, commands_path] + ([snapshot_path] if snapshot_path else [])
+    with open(commands_path, "rb") as file:
+        commands = sum(1 for line in file if line.strip())
+
+    started = time.perf_counter()
+    completed = subprocess.run(arguments, stdout=subprocess.PIPE, check=True)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "commands": commands,
+        "wall_seconds": elapsed,
+        "commands_per_second": commands / elapsed if elapsed else 0.0,
+        "output_bytes": len(completed.stdout),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="action", required=True)
+
+    generate_parser = subparsers.add_parser("generate")
+    generate_parser.add_argument("directory")
+    generate_parser.add_argument("--members", type=int, default=100_000)
+    generate_parser.add_argument("--commands", type=int, default=1_000_000)
+    generate_parser.add_argument("--seed", type=int, default=0)
+    generate_parser.add_argument("--female-ratio", type=float, default=0.5)
+    generate_parser.add_argument("--marriage-rate", type=float, default=0.7)
+    generate_parser.add_argument("--max-children", type=int, default=4)
+    generate_parser.add_argument("--depth", type=int, default=None)
+    generate_parser.add_argument("--add-ratio", type=float, default=0.01)
+    generate_parser.add_argument("--miss-ratio", type=float, default=0.01)
+
+    replay_parser = subparsers.add_parser("replay")
+    replay_parser.add_argument("commands_file")
+    replay_parser.add_argument("snapshot_file", nargs="?", default=None)
+    replay_parser.add_argument("--process", action="store_true")
+
+    args = parser.parse_args()
+    if args.action == "generate":
+        report = write_workload(directory=args.directory, members=args.members, commands=args.commands,
+                                seed=args.seed, female_ratio=args.female_ratio, marriage_rate=args.marriage_rate,
+                                max_children=args.max_children, depth=args.depth, add_ratio=args.add_ratio,
+                                miss_ratio=args.miss_ratio)
+    elif args.process:
+        report = replay_process(commands_path=args.commands_file, snapshot_path=args.snapshot_file)
+    else:
+        report = replay(commands_path=args.commands_file, snapshot_path=args.snapshot_file)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()